@@ -1,7 +1,8 @@
 import os
 import asyncio
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from azure.cosmos.aio import CosmosClient as AsyncCosmosClient
 from azure.cosmos import exceptions
@@ -22,59 +23,221 @@ class CosmosClient:
         self.key = os.getenv('COSMOS_KEY', '')
         self.database_name = 'pharma-cosmos'
         self.container_name = 'predictions'
+        # Low-cardinality partition key: aggregates over one model version
+        # stay on a single logical partition instead of fanning out
+        self.model_version = os.getenv('MODEL_VERSION', '1.0.0')
         
         # Initialize client
         self.client = None
         self.database = None
         self.container = None
         self.is_initialized = False
+        self._init_lock = asyncio.Lock()
+
+        # In-process TTL cache for prediction stats (dashboard polls hit
+        # this endpoint every few seconds with identical queries)
+        self.stats_ttl_seconds = float(os.getenv('STATS_TTL_SECONDS', '30'))
+        self._stats_cache = None
+        self._stats_cache_time = 0.0
+        self._stats_lock = asyncio.Lock()
+
+        # Write batching: concurrent predictions are queued and flushed
+        # together instead of paying one create_item round trip each
+        self.batch_max_size = int(os.getenv('COSMOS_BATCH_MAX_SIZE', '100'))
+        self.batch_flush_seconds = float(os.getenv('COSMOS_BATCH_FLUSH_MS', '20')) / 1000.0
+        self.batch_max_attempts = int(os.getenv('COSMOS_BATCH_MAX_ATTEMPTS', '3'))
+        self._write_queue = None
+        self._writer_task = None
+        # Failed-write attempt counts by document id, so flush retries are
+        # bounded instead of looping forever on a down backend
+        self._flush_attempts = {}
     
     async def initialize(self):
-        """Initialize Cosmos DB client and create database/container if needed"""
+        """Initialize Cosmos DB client; resources are assumed to pre-exist"""
         try:
             if self.is_initialized:
                 return
-            
-            # Create async client
-            self.client = AsyncCosmosClient(self.endpoint, self.key)
-            
-            # Create database if it doesn't exist
-            try:
-                self.database = await self.client.create_database_if_not_exists(id=self.database_name)
-                logger.info(f"Database '{self.database_name}' ready")
-            except exceptions.CosmosResourceExistsError:
+
+            # Single-flight: a cold-start burst of requests would otherwise
+            # race into duplicate client/bootstrap work; the first caller
+            # initializes while the rest wait and re-check the flag
+            async with self._init_lock:
+                if self.is_initialized:
+                    return
+
+                # Create async client
+                self.client = AsyncCosmosClient(self.endpoint, self.key)
+
+                # Resource creation is a one-shot bootstrap step (K8s Job /
+                # deploy script with COSMOS_BOOTSTRAP=1); regular pods just
+                # bind the local clients without any metadata round trips
+                if os.getenv('COSMOS_BOOTSTRAP') == '1':
+                    await self._bootstrap_resources()
+
                 self.database = self.client.get_database_client(self.database_name)
-                logger.info(f"Using existing database '{self.database_name}'")
-            
-            # Create container if it doesn't exist
-            try:
-                self.container = await self.database.create_container_if_not_exists(
-                    id=self.container_name,
-                    partition_key="/prediction_id",
-                    offer_throughput=400  # Minimum throughput for cost optimization
-                )
-                logger.info(f"Container '{self.container_name}' ready")
-            except exceptions.CosmosResourceExistsError:
                 self.container = self.database.get_container_client(self.container_name)
-                logger.info(f"Using existing container '{self.container_name}'")
-            
-            self.is_initialized = True
-            logger.info("Cosmos DB client initialized successfully")
-            
+
+                # One metadata read per process: catches containers that
+                # predate the /model_version partition key before they
+                # silently serve empty query results
+                await self._verify_partition_key()
+
+                self.is_initialized = True
+                logger.info("Cosmos DB client initialized successfully")
+
         except Exception as e:
             logger.error(f"Error initializing Cosmos DB client: {str(e)}")
             # For development, we'll continue without Cosmos DB
             logger.warning("Continuing without Cosmos DB connection (development mode)")
+
+    async def _bootstrap_resources(self):
+        """Create the database and container (bootstrap jobs only)"""
+        try:
+            await self.client.create_database_if_not_exists(id=self.database_name)
+            logger.info(f"Database '{self.database_name}' ready")
+        except exceptions.CosmosResourceExistsError:
+            logger.info(f"Using existing database '{self.database_name}'")
+
+        database = self.client.get_database_client(self.database_name)
+        try:
+            await database.create_container_if_not_exists(
+                id=self.container_name,
+                partition_key="/model_version",
+                offer_throughput=400,  # Minimum throughput for cost optimization
+                indexing_policy={
+                    # Composite index serving the recency query so the
+                    # engine reads the ORDER BY directly from the index
+                    "compositeIndexes": [[
+                        {"path": "/model_version", "order": "ascending"},
+                        {"path": "/timestamp", "order": "descending"}
+                    ]]
+                }
+            )
+            logger.info(f"Container '{self.container_name}' ready")
+        except exceptions.CosmosResourceExistsError:
+            logger.info(f"Using existing container '{self.container_name}'")
+
+        # Sentinel document for the health-check point read; it lives on
+        # its own partition so it never shows up in prediction stats
+        container = database.get_container_client(self.container_name)
+        await container.upsert_item(body={"id": "_health", "model_version": "_health"})
+        logger.info("Health-check sentinel document ready")
     
+    async def _verify_partition_key(self):
+        """Log loudly when the container's partition key is not /model_version.
+
+        The partition key of an existing container cannot be changed, so a
+        container created by older releases (partitioned on /prediction_id)
+        makes every model_version-pinned query silently return nothing; the
+        container has to be dropped and re-bootstrapped (see the README's
+        partition key migration notes).
+        """
+        try:
+            properties = await self.container.read()
+        except exceptions.CosmosResourceNotFoundError:
+            logger.error(
+                f"Cosmos container '{self.container_name}' does not exist; "
+                "run the bootstrap job (COSMOS_BOOTSTRAP=1, "
+                "k8s/cosmos-bootstrap-job.yaml) before serving traffic"
+            )
+            return
+        except Exception as e:
+            logger.warning(f"Could not verify container partition key: {str(e)}")
+            return
+
+        paths = properties.get("partitionKey", {}).get("paths", [])
+        if paths and paths != ["/model_version"]:
+            logger.error(
+                f"Cosmos container '{self.container_name}' is partitioned on "
+                f"{paths[0]} instead of /model_version; partition-pinned "
+                "queries will return no data. Drop and recreate the container "
+                "via the bootstrap job (see README: Cosmos DB partition key "
+                "migration)"
+            )
+
+    def start_write_batcher(self):
+        """Start the background task that coalesces prediction writes"""
+        if self._writer_task is None:
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._write_loop())
+            logger.info("Cosmos DB write batcher started")
+
+    async def _write_loop(self):
+        """Drain queued documents and flush them in batches"""
+        while True:
+            batch = [await self._write_queue.get()]
+            deadline = asyncio.get_event_loop().time() + self.batch_flush_seconds
+
+            # Collect whatever else arrives within the flush window
+            while len(batch) < self.batch_max_size:
+                timeout = deadline - asyncio.get_event_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush_batch(batch)
+            for _ in batch:
+                self._write_queue.task_done()
+
+    async def _flush_batch(self, documents: List[Dict[str, Any]]):
+        """Write a batch of documents as concurrent point creates.
+
+        The pinned async SDK (azure-cosmos 4.5.x) has no transactional
+        batch API, so the group is flushed with one concurrent
+        create_item per document. Failed documents are re-queued up to
+        batch_max_attempts times rather than silently dropped.
+        """
+        results = await asyncio.gather(
+            *(self.container.create_item(body=document) for document in documents),
+            return_exceptions=True
+        )
+
+        failures = []
+        written = 0
+        for document, result in zip(documents, results):
+            if isinstance(result, Exception):
+                failures.append((document, result))
+            else:
+                written += 1
+                self._flush_attempts.pop(document["id"], None)
+
+        if written:
+            logger.info(f"Flushed batch of {written} predictions to Cosmos DB")
+
+            # New data invalidates the cached stats
+            self._stats_cache = None
+
+        if failures:
+            logger.error(
+                f"Failed to write {len(failures)} of {len(documents)} queued "
+                f"predictions: {str(failures[0][1])}"
+            )
+            for document, _ in failures:
+                attempts = self._flush_attempts.get(document["id"], 0) + 1
+                if attempts < self.batch_max_attempts:
+                    self._flush_attempts[document["id"]] = attempts
+                    self._write_queue.put_nowait(document)
+                else:
+                    self._flush_attempts.pop(document["id"], None)
+                    logger.error(
+                        f"Dropping prediction {document['id']} after "
+                        f"{attempts} failed write attempts"
+                    )
+
     async def store_prediction(self, prediction_data: Dict[str, Any]) -> Optional[str]:
         """Store a prediction result in Cosmos DB"""
         try:
-            await self.initialize()
-            
+            # Fast path: skip coroutine scheduling once initialized
+            if not self.is_initialized:
+                await self.initialize()
+
             if not self.is_initialized:
                 logger.warning("Cosmos DB not initialized, skipping storage")
                 return None
-            
+
             # Prepare document
             document = {
                 "id": str(uuid.uuid4()),
@@ -84,104 +247,160 @@ class CosmosClient:
                 "prediction": prediction_data.get("prediction"),
                 "probability": prediction_data.get("probability"),
                 "confidence": prediction_data.get("confidence", "unknown"),
-                "model_version": "1.0.0",
+                "model_version": self.model_version,
                 "request_source": "api"
             }
-            
-            # Store in Cosmos DB
+
+            # Queue for batched writing; the id is pre-generated so the
+            # caller gets it back without waiting for the flush
+            if self._writer_task is not None:
+                await self._write_queue.put(document)
+                return document['id']
+
+            # Fallback: direct write when the batcher is not running
             response = await self.container.create_item(body=document)
             logger.info(f"Prediction stored with ID: {document['id']}")
+
+            # New data invalidates the cached stats
+            self._stats_cache = None
             return document['id']
-            
+
         except Exception as e:
             logger.error(f"Error storing prediction: {str(e)}")
             return None
     
-    async def get_predictions(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Retrieve recent predictions from Cosmos DB"""
+    async def get_predictions(self, limit: int = 100, continuation_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Retrieve one page of recent predictions plus a continuation token"""
         try:
-            await self.initialize()
-            
+            # Fast path: skip coroutine scheduling once initialized
+            if not self.is_initialized:
+                await self.initialize()
+
             if not self.is_initialized:
                 logger.warning("Cosmos DB not initialized, returning empty list")
-                return []
-            
-            # Query for recent predictions
-            query = f"SELECT * FROM c ORDER BY c.timestamp DESC OFFSET 0 LIMIT {limit}"
-            
+                return [], None
+
+            # Query for recent predictions; parameterized so the server can
+            # cache the query plan, and pinned to one partition (ODE path).
+            # No TOP clause: it would complete the query on the first page
+            # and null the continuation token, breaking pagination. The
+            # max_item_count page bound already stops server-side row
+            # production at the limit since only one page is read
+            query = (
+                "SELECT * FROM c "
+                "WHERE c.model_version = @model_version "
+                "ORDER BY c.timestamp DESC"
+            )
+
+            # Fetch a single page instead of draining the whole iterator;
+            # the caller resumes from the returned continuation token
+            pager = self.container.query_items(
+                query=query,
+                parameters=[
+                    {"name": "@model_version", "value": self.model_version}
+                ],
+                partition_key=self.model_version,
+                max_item_count=limit
+            ).by_page(continuation_token)
+
             items = []
-            async for item in self.container.query_items(query):
-                items.append(item)
-            
+            next_token = None
+            try:
+                page = await pager.__anext__()
+                async for item in page:
+                    items.append(item)
+                    if len(items) >= limit:
+                        break
+                next_token = pager.continuation_token
+            except StopAsyncIteration:
+                pass
+
             logger.info(f"Retrieved {len(items)} predictions from Cosmos DB")
-            return items
-            
+            return items, next_token
+
         except Exception as e:
             logger.error(f"Error retrieving predictions: {str(e)}")
-            return []
+            return [], None
     
     async def get_prediction_stats(self) -> Dict[str, Any]:
-        """Get prediction statistics from Cosmos DB"""
+        """Get prediction statistics from Cosmos DB (cached for a short TTL)"""
         try:
+            # Serve recent results from memory to avoid repeating the
+            # cross-partition aggregate on every dashboard poll
+            if self._stats_cache is not None and time.monotonic() - self._stats_cache_time < self.stats_ttl_seconds:
+                return self._stats_cache
+
             await self.initialize()
-            
+
             if not self.is_initialized:
                 logger.warning("Cosmos DB not initialized, returning empty stats")
                 return {}
-            
-            # Count total predictions
-            count_query = "SELECT VALUE COUNT(1) FROM c"
-            count_items = []
-            async for item in self.container.query_items(
-                query=count_query,
-                enable_cross_partition_query=True
-            ):
-                count_items.append(item)
-            
-            total_predictions = count_items[0] if count_items else 0
-            
-            # Get effective vs non-effective predictions
-            effective_query = "SELECT VALUE COUNT(1) FROM c WHERE c.prediction = 1"
-            effective_items = []
-            async for item in self.container.query_items(
-                query=effective_query,
-                enable_cross_partition_query=True
-            ):
-                effective_items.append(item)
-            
-            effective_count = effective_items[0] if effective_items else 0
-            
-            # Calculate statistics
-            stats = {
-                "total_predictions": total_predictions,
-                "effective_predictions": effective_count,
-                "non_effective_predictions": total_predictions - effective_count,
-                "effectiveness_rate": (effective_count / total_predictions * 100) if total_predictions > 0 else 0,
-                "last_updated": datetime.utcnow().isoformat()
-            }
-            
+
+            # Single-flight the refresh so a burst of polls runs one query
+            async with self._stats_lock:
+                if self._stats_cache is not None and time.monotonic() - self._stats_cache_time < self.stats_ttl_seconds:
+                    return self._stats_cache
+
+                stats = await self._query_prediction_stats()
+                self._stats_cache = stats
+                self._stats_cache_time = time.monotonic()
+
             logger.info(f"Retrieved prediction statistics: {stats}")
             return stats
-            
+
         except Exception as e:
             logger.error(f"Error retrieving prediction statistics: {str(e)}")
             return {}
+
+    async def _query_prediction_stats(self) -> Dict[str, Any]:
+        """Run the aggregate stats query against Cosmos DB"""
+        # Count total and effective predictions in a single aggregate query,
+        # pinned to the model-version partition so there is no fan-out
+        stats_query = (
+            "SELECT COUNT(1) AS total, SUM(c.prediction) AS effective "
+            "FROM c WHERE c.model_version = @model_version"
+        )
+        stats_items = []
+        async for item in self.container.query_items(
+            query=stats_query,
+            parameters=[{"name": "@model_version", "value": self.model_version}],
+            partition_key=self.model_version,
+            max_item_count=1
+        ):
+            stats_items.append(item)
+
+        aggregates = stats_items[0] if stats_items else {}
+        total_predictions = aggregates.get("total", 0) or 0
+        effective_count = aggregates.get("effective", 0) or 0
+
+        # Calculate statistics
+        return {
+            "total_predictions": total_predictions,
+            "effective_predictions": effective_count,
+            "non_effective_predictions": total_predictions - effective_count,
+            "effectiveness_rate": (effective_count / total_predictions * 100) if total_predictions > 0 else 0,
+            "last_updated": datetime.utcnow().isoformat()
+        }
     
     async def health_check(self) -> bool:
         """Check if Cosmos DB connection is healthy"""
         try:
-            await self.initialize()
-            
+            # Fast path: skip coroutine scheduling once initialized
+            if not self.is_initialized:
+                await self.initialize()
+
             if not self.is_initialized:
                 return False
             
-            # Try to query the database
-            query = "SELECT VALUE COUNT(1) FROM c"
-            count = 0
-            async for item in self.container.query_items(query):
-                count = item
-                break
-            
+            # Point read of the sentinel document: ~1 RU instead of a
+            # COUNT query over prediction documents
+            try:
+                await self.container.read_item(item="_health", partition_key="_health")
+            except exceptions.CosmosResourceNotFoundError:
+                # Sentinel not provisioned yet; a metadata read still
+                # verifies connectivity
+                await self.database.read()
+
             logger.info("Cosmos DB health check passed")
             return True
             
@@ -190,10 +409,36 @@ class CosmosClient:
             return False
     
     async def close(self):
-        """Close Cosmos DB client connection"""
+        """Flush pending writes and close Cosmos DB client connection"""
+        if self._writer_task is not None:
+            await self._write_queue.join()
+            self._writer_task.cancel()
+            self._writer_task = None
+            logger.info("Cosmos DB write batcher stopped")
+
         if self.client:
             await self.client.close()
             logger.info("Cosmos DB client connection closed")
 
 # Global instance for use across the application
 cosmos_client = CosmosClient()
+
+
+async def _run_bootstrap():
+    """Create the Cosmos DB resources and exit (deploy jobs only).
+
+    Unlike initialize(), failures propagate so the bootstrap job is
+    marked failed instead of degrading to development mode.
+    """
+    client = CosmosClient()
+    client.client = AsyncCosmosClient(client.endpoint, client.key)
+    try:
+        await client._bootstrap_resources()
+    finally:
+        await client.client.close()
+
+
+if __name__ == "__main__":
+    # One-shot bootstrap entry point, used by k8s/cosmos-bootstrap-job.yaml:
+    #   python -m app.database.cosmos_client
+    asyncio.run(_run_bootstrap())
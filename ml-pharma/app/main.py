@@ -1,14 +1,18 @@
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 import uvicorn
 import asyncio
+import joblib
+import orjson
 import time
 import logging
 import os
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
 
 # Import application modules
 try:
@@ -16,7 +20,7 @@ try:
     from .models.logistic_regression import PharmaLogisticRegression
     from .models.data_processor import DataProcessor
     from .database.cosmos_client import cosmos_client
-    from .monitoring.metrics import metrics_collector
+    from .monitoring.metrics import get_metrics_collector
 except ImportError:
     # For direct execution
     import sys
@@ -25,7 +29,7 @@ except ImportError:
     from app.models.logistic_regression import PharmaLogisticRegression
     from app.models.data_processor import DataProcessor
     from app.database.cosmos_client import cosmos_client
-    from app.monitoring.metrics import metrics_collector
+    from app.monitoring.metrics import get_metrics_collector
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +39,15 @@ logger = logging.getLogger(__name__)
 ml_model = None
 data_processor = None
 
+@lru_cache(maxsize=1)
+def _format_timestamp(epoch_seconds: int) -> str:
+    """Format an epoch second as a UTC timestamp string"""
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+def _utc_timestamp() -> str:
+    """Current UTC timestamp, cached per second to avoid re-running strftime"""
+    return _format_timestamp(int(time.time()))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events"""
@@ -42,40 +55,57 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up ML Pharma API...")
     
     global ml_model, data_processor
-    
-    try:
-        # Initialize data processor
-        data_processor = DataProcessor()
+
+    # Track in-flight background writes so shutdown can flush them
+    app.state.pending_writes = set()
+
+    def prepare_model():
+        """Load the persisted model and processor, or train from scratch"""
+        processor = DataProcessor()
         logger.info("Data processor initialized")
-        
+
         # Initialize and train ML model
-        ml_model = PharmaLogisticRegression()
-        
-        # Check if pre-trained model exists
+        model = PharmaLogisticRegression()
+
+        # Check if pre-trained model and fitted processor exist; the
+        # processor must be reloaded too, or its scaler starts unfitted
         model_path = "models/pharma_model.joblib"
-        if os.path.exists(model_path):
+        processor_path = "models/pharma_processor.joblib"
+        if os.path.exists(model_path) and os.path.exists(processor_path):
             logger.info("Loading pre-trained model...")
-            ml_model.load_model(model_path)
+            model.load_model(model_path)
+            processor = joblib.load(processor_path)
+            logger.info("Data processor loaded from disk")
         else:
             logger.info("Training new model...")
             # Create synthetic data for training
-            df = data_processor.create_synthetic_pharma_data(n_samples=2000)
-            X, y = data_processor.prepare_features(df)
-            X_train, X_test, y_train, y_test = data_processor.split_data(X, y)
-            
+            df = processor.create_synthetic_pharma_data(n_samples=2000)
+            X, y = processor.prepare_features(df)
+            X_train, X_test, y_train, y_test = processor.split_data(X, y)
+
             # Train the model
-            training_metrics = ml_model.train(X_train, y_train, X_test, y_test)
+            training_metrics = model.train(X_train, y_train, X_test, y_test)
             logger.info(f"Model training completed: {training_metrics}")
-            
-            # Save the trained model
+
+            # Save the trained model and the fitted processor
             os.makedirs("models", exist_ok=True)
-            ml_model.save_model(model_path)
-        
-        # Initialize Cosmos DB connection
-        await cosmos_client.initialize()
-        
+            model.save_model(model_path)
+            joblib.dump(processor, processor_path)
+
+        return model, processor
+
+    try:
+        # Cosmos init is pure I/O, so let it overlap with the CPU-bound
+        # model setup instead of running the two sequentially
+        cosmos_task = asyncio.create_task(cosmos_client.initialize())
+        ml_model, data_processor = await asyncio.to_thread(prepare_model)
+        await cosmos_task
+
+        # Start the batched prediction writer
+        cosmos_client.start_write_batcher()
+
         logger.info("ML Pharma API startup completed successfully")
-        
+
     except Exception as e:
         logger.error(f"Error during startup: {str(e)}")
         raise
@@ -84,6 +114,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down ML Pharma API...")
+    if app.state.pending_writes:
+        await asyncio.gather(*app.state.pending_writes, return_exceptions=True)
     await cosmos_client.close()
     logger.info("ML Pharma API shutdown completed")
 
@@ -94,7 +126,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # C-backed JSON serialization
 )
 
 # CORS middleware
@@ -137,24 +170,31 @@ class MetricsResponse(BaseModel):
     application: Optional[Dict[str, Any]] = None
     status: str
 
+# Endpoints cheap enough that recording metrics costs more than serving them
+METRICS_EXEMPT_PATHS = {"/", "/health"}
+
 # Middleware for request metrics collection
 @app.middleware("http")
 async def collect_request_metrics(request: Request, call_next):
-    start_time = time.time()
-    
+    # Skip metrics bookkeeping entirely for known-cheap endpoints
+    if request.url.path in METRICS_EXEMPT_PATHS:
+        return await call_next(request)
+
+    start_time = time.perf_counter_ns()
+
     response = await call_next(request)
-    
+
     # Calculate duration
-    duration = time.time() - start_time
-    
+    duration = (time.perf_counter_ns() - start_time) / 1e9
+
     # Record metrics
-    metrics_collector.record_request(
+    get_metrics_collector().record_request(
         method=request.method,
         endpoint=request.url.path,
         status_code=response.status_code,
         duration=duration
     )
-    
+
     return response
 
 # API Endpoints
@@ -177,7 +217,7 @@ async def health_check():
         
         return HealthResponse(
             status="healthy",
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
+            timestamp=_utc_timestamp(),
             model_loaded=ml_model is not None and ml_model.is_trained,
             cosmos_db_status=cosmos_status,
             version="1.0.0"
@@ -206,15 +246,17 @@ async def predict(request: PredictionRequest):
         
         # Record inference time
         inference_time = time.time() - start_time
-        metrics_collector.record_prediction(prediction_result['prediction'], inference_time)
+        get_metrics_collector().record_prediction(prediction_result['prediction'], inference_time)
         
-        # Store prediction in Cosmos DB
-        await cosmos_client.store_prediction({
+        # Store prediction in Cosmos DB without blocking the response
+        store_task = asyncio.create_task(cosmos_client.store_prediction({
             "features": request.features,
             "prediction": prediction_result['prediction'],
             "probability": prediction_result['max_probability'],
             "confidence": prediction_result['confidence']
-        })
+        }))
+        app.state.pending_writes.add(store_task)
+        store_task.add_done_callback(app.state.pending_writes.discard)
         
         # Prepare response
         response = PredictionResponse(
@@ -240,7 +282,7 @@ async def predict(request: PredictionRequest):
 async def get_metrics():
     """Get system and application metrics"""
     try:
-        comprehensive_metrics = metrics_collector.get_comprehensive_metrics()
+        comprehensive_metrics = get_metrics_collector().get_comprehensive_metrics()
         
         return MetricsResponse(
             system=comprehensive_metrics.get("system", {}),
@@ -299,6 +341,35 @@ async def get_feature_info():
         logger.error(f"Error retrieving feature info: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve feature info")
 
+@app.get("/sidebar")
+async def get_sidebar_info():
+    """Get health, model and feature info in a single round-trip.
+
+    Lets the dashboard populate its sidebar with one HTTP call instead
+    of three; sections whose backing service is unavailable come back
+    as null rather than failing the whole payload.
+    """
+    try:
+        health = await health_check()
+
+        model_info = None
+        if ml_model is not None:
+            model_info = ml_model.get_model_info()
+
+        feature_info = None
+        if data_processor is not None and data_processor.get_feature_names() is not None:
+            feature_info = await get_feature_info()
+
+        return {
+            "health": health,
+            "model": model_info,
+            "features": feature_info
+        }
+
+    except Exception as e:
+        logger.error(f"Error retrieving sidebar info: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve sidebar info")
+
 @app.get("/predictions/stats")
 async def get_prediction_stats():
     """Get prediction statistics from database"""
@@ -311,23 +382,123 @@ async def get_prediction_stats():
         raise HTTPException(status_code=500, detail="Failed to retrieve prediction statistics")
 
 @app.get("/predictions/recent")
-async def get_recent_predictions(limit: int = 10):
+async def get_recent_predictions(limit: int = 10, continuation_token: Optional[str] = None):
     """Get recent predictions from database"""
     try:
         if limit > 100:
             limit = 100  # Limit to prevent excessive data transfer
-        
-        predictions = await cosmos_client.get_predictions(limit=limit)
-        return {"predictions": predictions, "count": len(predictions)}
+
+        predictions, next_token = await cosmos_client.get_predictions(
+            limit=limit, continuation_token=continuation_token
+        )
+        return {
+            "predictions": predictions,
+            "count": len(predictions),
+            "continuation_token": next_token
+        }
         
     except Exception as e:
         logger.error(f"Error retrieving recent predictions: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve recent predictions")
 
+@app.get("/predictions/recent.arrow")
+async def get_recent_predictions_arrow(limit: int = 10):
+    """Get recent predictions as an Arrow file for zero-copy DataFrame loads"""
+    try:
+        import io
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        if limit > 100:
+            limit = 100  # Limit to prevent excessive data transfer
+
+        predictions, _ = await cosmos_client.get_predictions(limit=limit)
+
+        # Columnar layout serializes straight into Arrow; the client reads
+        # it back into a DataFrame without per-row JSON decoding
+        table = pa.table({
+            "timestamp": [p.get("timestamp", "") for p in predictions],
+            "prediction": [p.get("prediction") for p in predictions],
+            "probability": [p.get("probability", 0.0) for p in predictions],
+            "confidence": [p.get("confidence", "unknown") for p in predictions]
+        })
+
+        buffer = io.BytesIO()
+        feather.write_feather(table, buffer)
+        return Response(
+            content=buffer.getvalue(),
+            media_type="application/vnd.apache.arrow.file"
+        )
+
+    except Exception as e:
+        logger.error(f"Error serializing recent predictions: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve recent predictions")
+
+async def _build_dashboard_snapshot() -> Dict[str, Any]:
+    """Assemble the aggregated dashboard payload"""
+    # One round trip for the dashboard instead of four; the database
+    # calls run concurrently
+    comprehensive_metrics = get_metrics_collector().get_comprehensive_metrics()
+    stats, recent, cosmos_status = await asyncio.gather(
+        cosmos_client.get_prediction_stats(),
+        cosmos_client.get_predictions(limit=10),
+        cosmos_client.health_check()
+    )
+    predictions, next_token = recent
+
+    return {
+        "metrics": {
+            "system": comprehensive_metrics.get("system", {}),
+            "application": comprehensive_metrics.get("application", {}),
+            "status": comprehensive_metrics.get("status", "unknown")
+        },
+        "stats": stats,
+        "recent": {
+            "predictions": predictions,
+            "count": len(predictions),
+            "continuation_token": next_token
+        },
+        "health": {
+            "status": "healthy",
+            "timestamp": _utc_timestamp(),
+            "model_loaded": ml_model is not None and ml_model.is_trained,
+            "cosmos_db_status": cosmos_status,
+            "version": "1.0.0"
+        }
+    }
+
+@app.get("/dashboard-snapshot")
+async def get_dashboard_snapshot():
+    """Get all dashboard payloads in a single response"""
+    try:
+        return await _build_dashboard_snapshot()
+
+    except Exception as e:
+        logger.error(f"Error building dashboard snapshot: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to build dashboard snapshot")
+
+@app.get("/dashboard-stream")
+async def dashboard_stream(interval: float = 5.0):
+    """Stream dashboard snapshots as server-sent events"""
+    interval = min(max(interval, 1.0), 60.0)
+
+    async def event_stream():
+        # Push a snapshot per interval; clients get updates without
+        # re-establishing a connection for every poll
+        while True:
+            try:
+                snapshot = await _build_dashboard_snapshot()
+                yield f"data: {orjson.dumps(snapshot).decode()}\n\n"
+            except Exception as e:
+                logger.error(f"Error streaming dashboard snapshot: {str(e)}")
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 # Exception handlers
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={"detail": "Endpoint not found", "path": str(request.url.path)}
     )
@@ -335,9 +506,9 @@ async def not_found_handler(request: Request, exc):
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc):
     logger.error(f"Internal server error: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
-        content={"detail": "Internal server error", "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())}
+        content={"detail": "Internal server error", "timestamp": _utc_timestamp()}
     )
 
 # Run the application
@@ -347,5 +518,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",
+        http="httptools"
     )
@@ -0,0 +1,447 @@
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from scipy.special import expit
+from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support, roc_auc_score
+from typing import Dict, Any, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# Numba is optional; when present, single-row inference runs through a
+# JIT-compiled kernel instead of NumPy dispatch
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _lr_proba_single(x, w, b):
+        """Sigmoid of the dot product for one sample, compiled to machine code"""
+        z = 0.0
+        for i in range(w.shape[0]):
+            z += x[i] * w[i]
+        z += b
+        return 1.0 / (1.0 + math.exp(-z))
+else:
+    _lr_proba_single = None
+
+# Directories already ensured by save_model this process; skips the
+# repeated os.makedirs stat calls on hot re-save paths
+_MKDIR_CACHE = set()
+
+# Test sets smaller than this are scored in-process; below it the fork
+# and pickling overhead of a process pool costs more than it saves
+_PARALLEL_SCORE_THRESHOLD = 50_000
+
+def _score_chunk(model, X_chunk):
+    """Worker: probability of class 1 for one chunk of samples"""
+    return model.predict_proba(X_chunk)[:, 1]
+
+class BatchingPredictor:
+    """Coalesce concurrent single-sample predictions into one vectorized call"""
+
+    def __init__(self, predict_proba_fn, max_batch: int = 64, max_delay_ms: float = 10.0):
+        self._predict_proba = predict_proba_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, features: np.ndarray) -> Future:
+        """Queue one sample and return a Future resolving to its probabilities"""
+        future = Future()
+        self._queue.put((features, future))
+        return future
+
+    def _worker(self):
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+
+            # Collect whatever else arrives within the batching window
+            while len(items) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            # One stacked predict_proba call amortizes the per-call
+            # overhead across the whole batch
+            X = np.vstack([features for features, _ in items])
+            try:
+                probabilities = self._predict_proba(X)
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            for row, (_, future) in zip(probabilities, items):
+                future.set_result(row)
+
+class PharmaLogisticRegression:
+    # Interpretation strings precomputed per (prediction, probability bucket);
+    # the bucket index is 2 for prob > 0.8, 1 for prob > 0.6, else 0
+    _CONFIDENCE = ("low", "medium", "high")
+    _INTERP = {
+        (1, 2): "Treatment is highly likely to be effective",
+        (1, 1): "Treatment is likely to be effective",
+        (1, 0): "Treatment may be effective (low confidence)",
+        (0, 2): "Treatment is highly unlikely to be effective",
+        (0, 1): "Treatment is unlikely to be effective",
+        (0, 0): "Treatment effectiveness is uncertain"
+    }
+
+    def __init__(self, random_state: int = 42, enable_batching: bool = False,
+                 solver: str = 'lbfgs', n_jobs: int = -1):
+        # lbfgs parallelizes over cores via threaded BLAS (liblinear is
+        # single-threaded); pass solver='saga' if L1 penalties are needed
+        self.model = LogisticRegression(
+            random_state=random_state,
+            max_iter=1000,
+            solver=solver,
+            n_jobs=n_jobs
+        )
+        self.enable_batching = enable_batching
+        self._batcher = None
+        # Dense float32 weights for the direct inference path
+        self._W = None
+        self._b = None
+        self.is_trained = False
+        self.feature_names = None
+        self.training_metrics = {}
+        self.model_version = "1.0.0"
+        # Memoize single predictions on the feature tuple; repeated
+        # identical queries skip model evaluation entirely
+        self._predict_cached = lru_cache(maxsize=4096)(self._predict_single_uncached)
+        # Model info only changes on train/load; memoize the built dict
+        self._model_info_cache = None
+    
+    def train(self, X_train: pd.DataFrame, y_train: pd.Series, X_test: Optional[pd.DataFrame] = None, y_test: Optional[pd.Series] = None) -> Dict[str, Any]:
+        """Train the logistic regression model"""
+        try:
+            logger.info("Starting model training...")
+            
+            # Store feature names
+            self.feature_names = X_train.columns.tolist()
+
+            # Contiguous float32 arrays hit the BLAS fast path directly;
+            # DataFrame input would force internal copies per call
+            X_train = np.ascontiguousarray(X_train, dtype=np.float32)
+            if X_test is not None:
+                X_test = np.ascontiguousarray(X_test, dtype=np.float32)
+
+            # Train the model
+            self.model.fit(X_train, y_train)
+            self.is_trained = True
+            self._cache_weights()
+
+            # Cached predictions and model info from a previous model are
+            # now stale
+            self._predict_cached.cache_clear()
+            self._model_info_cache = None
+
+            # Calculate training metrics; one probability pass yields both
+            # the probabilities and the labels (argmax == p1 >= 0.5). The
+            # arrays are already contiguous float32, so the raw GEMV path
+            # skips sklearn's per-call input validation
+            train_proba = self.fast_predict_proba(X_train)[:, 1]
+            train_predictions = (train_proba >= 0.5).astype(np.int8)
+            
+            metrics = {
+                'train_accuracy': accuracy_score(y_train, train_predictions),
+                'train_auc': roc_auc_score(y_train, train_proba),
+                'training_date': datetime.now().isoformat(),
+                'n_samples': len(X_train),
+                'n_features': len(self.feature_names),
+                'feature_names': self.feature_names
+            }
+            
+            # If test data is provided, calculate test metrics
+            if X_test is not None and y_test is not None:
+                # Large test sets are split across worker processes; each
+                # scores its chunk independently and the results concatenate
+                if len(X_test) > _PARALLEL_SCORE_THRESHOLD:
+                    test_proba = self._parallel_predict_proba(X_test)
+                else:
+                    test_proba = self.fast_predict_proba(X_test)[:, 1]
+                test_predictions = (test_proba >= 0.5).astype(np.int8)
+                
+                metrics.update({
+                    'test_accuracy': accuracy_score(y_test, test_predictions),
+                    'test_auc': roc_auc_score(y_test, test_proba),
+                    'test_samples': len(X_test)
+                })
+                
+                # Per-class precision/recall/F1 computed directly; the
+                # string-formatting layer of classification_report is
+                # skipped and the label arrays are only walked once
+                precision, recall, f1, support = precision_recall_fscore_support(
+                    y_test, test_predictions, average=None, zero_division=0
+                )
+                metrics['test_classification_report'] = {
+                    'precision': precision.tolist(),
+                    'recall': recall.tolist(),
+                    'f1_score': f1.tolist(),
+                    'support': support.tolist()
+                }
+                
+                logger.info(f"Test Accuracy: {metrics['test_accuracy']:.4f}")
+                logger.info(f"Test AUC: {metrics['test_auc']:.4f}")
+            
+            self.training_metrics = metrics
+            
+            logger.info(f"Model training completed successfully!")
+            logger.info(f"Training Accuracy: {metrics['train_accuracy']:.4f}")
+            logger.info(f"Training AUC: {metrics['train_auc']:.4f}")
+            
+            return metrics
+            
+        except Exception as e:
+            logger.error(f"Error during model training: {str(e)}")
+            raise
+    
+    def _parallel_predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Score a large sample set across worker processes"""
+        n_workers = os.cpu_count() or 1
+        chunks = np.array_split(X, n_workers)
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            parts = list(pool.map(_score_chunk, [self.model] * len(chunks), chunks))
+        return np.concatenate(parts)
+
+    def _cache_weights(self):
+        """Cache dense float32 coefficients for the direct inference path"""
+        self._W = np.ascontiguousarray(self.model.coef_, dtype=np.float32)
+        self._b = self.model.intercept_.astype(np.float32)
+
+    def fast_predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probabilities via a direct GEMV + sigmoid, skipping sklearn dispatch"""
+        z = X.astype(np.float32, copy=False) @ self._W.T + self._b
+        p1 = expit(z.ravel())
+        return np.column_stack([1.0 - p1, p1])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Make predictions"""
+        try:
+            if not self.is_trained:
+                raise ValueError("Model must be trained before making predictions")
+            
+            predictions = self.model.predict(X)
+            logger.info(f"Made predictions for {len(X)} samples")
+            return predictions
+            
+        except Exception as e:
+            logger.error(f"Error during prediction: {str(e)}")
+            raise
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Get prediction probabilities"""
+        try:
+            if not self.is_trained:
+                raise ValueError("Model must be trained before making predictions")
+            
+            probabilities = self.model.predict_proba(X)
+            logger.info(f"Generated probabilities for {len(X)} samples")
+            return probabilities
+            
+        except Exception as e:
+            logger.error(f"Error during probability prediction: {str(e)}")
+            raise
+    
+    def predict_single(self, features: list) -> Dict[str, Any]:
+        """Make prediction for a single sample with detailed output"""
+        try:
+            if not self.is_trained:
+                raise ValueError("Model must be trained before making predictions")
+
+            result = self._predict_cached(tuple(features))
+
+            logger.info(f"Single prediction completed: {result}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error during single prediction: {str(e)}")
+            raise
+
+    def _predict_single_uncached(self, features_tuple: tuple) -> Dict[str, Any]:
+        """Evaluate the model for one feature tuple (cache miss path)"""
+        # Build the row as float32 up front so the GEMV and JIT paths get
+        # the dtype they expect without converting again per call
+        features_array = np.asarray(features_tuple, dtype=np.float32).reshape(1, -1)
+
+        # One probability evaluation gives both the label and confidence;
+        # with batching enabled, concurrent samples share one model call.
+        # The cached-weight GEMV path skips sklearn's per-call validation
+        proba_fn = self.fast_predict_proba if self._W is not None else self.model.predict_proba
+        if self.enable_batching:
+            if self._batcher is None:
+                self._batcher = BatchingPredictor(proba_fn)
+            probabilities = self._batcher.submit(features_array).result()
+        elif _lr_proba_single is not None and self._W is not None:
+            # JIT kernel: no NumPy dispatch or temporaries for one row
+            p1 = _lr_proba_single(features_array[0], self._W[0], float(self._b[0]))
+            probabilities = np.array([1.0 - p1, p1])
+        else:
+            probabilities = proba_fn(features_array)[0]
+        prediction = int(probabilities[1] >= 0.5)
+
+        # Bucket the probability once; both the confidence label and the
+        # interpretation are table lookups on it
+        max_prob = float(probabilities.max())
+        bucket = (max_prob > 0.8) + (max_prob > 0.6)
+        confidence = self._CONFIDENCE[bucket]
+
+        return {
+            'prediction': prediction,
+            'probability_class_0': float(probabilities[0]),
+            'probability_class_1': float(probabilities[1]),
+            'max_probability': max_prob,
+            'confidence': confidence,
+            'interpretation': self._interpret_prediction(prediction, max_prob)
+        }
+
+    def _interpret_prediction(self, prediction: int, probability: float) -> str:
+        """Provide human-readable interpretation of the prediction"""
+        bucket = (probability > 0.8) + (probability > 0.6)
+        return self._INTERP[(prediction, bucket)]
+    
+    def get_feature_importance(self) -> Dict[str, float]:
+        """Get feature importance based on model coefficients"""
+        try:
+            if not self.is_trained:
+                raise ValueError("Model must be trained before getting feature importance")
+            
+            if self.feature_names is None:
+                raise ValueError("Feature names not available")
+            
+            # Get absolute coefficients as importance and sort in C via
+            # argsort instead of a Python sort over boxed floats
+            coefficients = np.abs(self.model.coef_[0])
+            order = np.argsort(coefficients)[::-1]
+            names = np.asarray(self.feature_names)
+
+            feature_importance = dict(zip(names[order].tolist(), coefficients[order].tolist()))
+            
+            logger.info("Feature importance calculated successfully")
+            return feature_importance
+            
+        except Exception as e:
+            logger.error(f"Error calculating feature importance: {str(e)}")
+            raise
+    
+    def save_model(self, filepath: str) -> None:
+        """Save trained model"""
+        try:
+            if not self.is_trained:
+                raise ValueError("Cannot save untrained model")
+            
+            # Create directory if it doesn't exist (once per process);
+            # a bare filename has no directory component to create
+            directory = os.path.dirname(filepath)
+            if directory and directory not in _MKDIR_CACHE:
+                os.makedirs(directory, exist_ok=True)
+                _MKDIR_CACHE.add(directory)
+            
+            # Prepare model data; the float32 weights are stored as derived
+            # fields so load_model can bind the fast path without touching
+            # the sklearn estimator
+            model_data = {
+                'model': self.model,
+                'feature_names': self.feature_names,
+                'training_metrics': self.training_metrics,
+                'model_version': self.model_version,
+                'is_trained': self.is_trained,
+                'coef_fp32': self.model.coef_.astype(np.float32),
+                'intercept_fp32': self.model.intercept_.astype(np.float32)
+            }
+
+            # Save the model; LZ4 is fast enough that compression pays for
+            # itself in I/O, and protocol 5 avoids an extra array copy
+            joblib.dump(model_data, filepath, compress=('lz4', 3), protocol=5)
+            logger.debug(f"Model saved successfully to {filepath}")
+            
+        except Exception as e:
+            logger.error(f"Error saving model: {str(e)}")
+            raise
+    
+    def load_model(self, filepath: str) -> None:
+        """Load trained model"""
+        try:
+            if not os.path.exists(filepath):
+                raise FileNotFoundError(f"Model file not found: {filepath}")
+            
+            # Load the model data
+            model_data = joblib.load(filepath)
+            
+            # Restore model state
+            self.model = model_data['model']
+            self.feature_names = model_data['feature_names']
+            self.training_metrics = model_data.get('training_metrics', {})
+            self.model_version = model_data.get('model_version', '1.0.0')
+            self.is_trained = model_data.get('is_trained', True)
+
+            # Prefer the persisted float32 weights; older artifacts fall
+            # back to deriving them from the estimator
+            if 'coef_fp32' in model_data:
+                self._W = np.ascontiguousarray(model_data['coef_fp32'])
+                self._b = model_data['intercept_fp32']
+                # Guard against artifacts whose derived weights were stored
+                # at a different precision
+                if self._W.dtype != np.float32:
+                    self._cache_weights()
+            else:
+                self._cache_weights()
+
+            # Cached predictions and model info from a previous model are
+            # now stale
+            self._predict_cached.cache_clear()
+            self._model_info_cache = None
+
+            logger.info(f"Model loaded successfully from {filepath}")
+            logger.info(f"Model version: {self.model_version}")
+            logger.info(f"Features: {len(self.feature_names) if self.feature_names else 0}")
+            
+        except Exception as e:
+            logger.error(f"Error loading model: {str(e)}")
+            raise
+    
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get comprehensive model information"""
+        if self._model_info_cache is not None:
+            return self._model_info_cache
+
+        info = {
+            'is_trained': self.is_trained,
+            'model_version': self.model_version,
+            'model_type': 'Logistic Regression',
+            'feature_count': len(self.feature_names) if self.feature_names else 0,
+            'feature_names': self.feature_names,
+            'training_metrics': self.training_metrics
+        }
+        
+        if self.is_trained:
+            info['model_parameters'] = {
+                'C': self.model.C,
+                'solver': self.model.solver,
+                'max_iter': self.model.max_iter,
+                'random_state': self.model.random_state
+            }
+
+        self._model_info_cache = info
+        return info
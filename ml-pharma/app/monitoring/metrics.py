@@ -1,6 +1,8 @@
+import os
 import psutil
 import time
 import threading
+import numpy as np
 from typing import Dict, Any
 from prometheus_client import Counter, Histogram, Gauge, start_http_server, CollectorRegistry
 import logging
@@ -60,11 +62,54 @@ class MetricsCollector:
             registry=self.registry
         )
         
-        # Internal metrics storage
+        # Internal metrics storage: one preallocated float array (SoA)
+        # holds the sampled values; the dict served to callers is rebuilt
+        # only when the background thread refreshes the snapshot
+        self._field_names = (
+            "cpu_usage_percent",
+            "memory_usage_bytes",
+            "memory_usage_percent",
+            "memory_total_bytes",
+            "memory_available_bytes",
+            "disk_usage_percent",
+            "disk_total_bytes",
+            "disk_used_bytes",
+            "disk_free_bytes",
+            "timestamp"
+        )
+        self._values = np.zeros(len(self._field_names))
         self.metrics_cache = {}
         self.cache_ttl = 5  # Cache metrics for 5 seconds
         self.last_update = 0
-        
+
+        # Disk usage changes slowly and the statvfs call is the most
+        # expensive sample; refresh it on its own, longer cadence
+        self.disk_sample_interval = 60
+        self._last_disk_ts = 0.0
+        self._last_disk = None
+
+        # Prime psutil's internal delta counter so later non-blocking
+        # cpu_percent calls return percent-since-last-call
+        psutil.cpu_percent(interval=None)
+
+        # Running aggregates so get_application_metrics is a few reads
+        # instead of walking Prometheus collect() output per call
+        self._agg_lock = threading.Lock()
+        self._request_count_total = 0
+        self._request_duration_sum = 0.0
+        self._prediction_count_total = 0
+        self._inference_time_sum = 0.0
+
+        # Bound .labels() children per label tuple; labels() re-validates
+        # and re-hashes its arguments on every call otherwise. Endpoint
+        # cardinality is small, the size cap is just a safety valve
+        self._children_cap = 1024
+        self._req_count_children = {}
+        self._req_duration_children = {}
+        self._prediction_children = {}
+
+        self._collection_thread = None
+
         # Start Prometheus HTTP server
         if enable_prometheus_server:
             try:
@@ -78,6 +123,10 @@ class MetricsCollector:
     
     def _start_background_collection(self):
         """Start background thread for continuous metrics collection"""
+        # Guard against double-starting (e.g. collector re-created in tests)
+        if self._collection_thread is not None and self._collection_thread.is_alive():
+            return
+
         def collect_metrics():
             while True:
                 try:
@@ -87,49 +136,59 @@ class MetricsCollector:
                     logger.error(f"Error in background metrics collection: {str(e)}")
                     time.sleep(30)  # Wait longer on error
         
-        thread = threading.Thread(target=collect_metrics, daemon=True)
-        thread.start()
+        self._collection_thread = threading.Thread(target=collect_metrics, daemon=True)
+        self._collection_thread.start()
         logger.info("Background metrics collection started")
     
     def _update_system_metrics(self):
         """Update system metrics and Prometheus gauges"""
         try:
-            # Get system metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Get system metrics; interval=None never sleeps, the 10s
+            # collection loop provides the sampling window
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
+
+            # Slow path: only hit the filesystem when the disk sample
+            # has aged out; cpu/memory stay on the 10s cadence
+            now = time.time()
+            if self._last_disk is None or now - self._last_disk_ts >= self.disk_sample_interval:
+                self._last_disk = psutil.disk_usage('/')
+                self._last_disk_ts = now
+            disk = self._last_disk
+
             # Update Prometheus metrics
             self.cpu_usage.set(cpu_percent)
             self.memory_usage.set(memory.used)
             self.disk_usage.set(disk.percent)
-            
-            # Update cache
-            self.metrics_cache = {
-                "cpu_usage_percent": cpu_percent,
-                "memory_usage_bytes": memory.used,
-                "memory_usage_percent": memory.percent,
-                "memory_total_bytes": memory.total,
-                "memory_available_bytes": memory.available,
-                "disk_usage_percent": disk.percent,
-                "disk_total_bytes": disk.total,
-                "disk_used_bytes": disk.used,
-                "disk_free_bytes": disk.free,
-                "timestamp": time.time()
-            }
+
+            # Write the sampled values into the preallocated array, then
+            # atomically publish a freshly built dict; readers holding the
+            # previous snapshot keep a consistent view and must not mutate it
+            self._values[:] = (
+                cpu_percent,
+                memory.used,
+                memory.percent,
+                memory.total,
+                memory.available,
+                disk.percent,
+                disk.total,
+                disk.used,
+                disk.free,
+                time.time()
+            )
+            self.metrics_cache = dict(zip(self._field_names, self._values.tolist()))
             self.last_update = time.time()
             
         except Exception as e:
             logger.error(f"Error updating system metrics: {str(e)}")
     
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics"""
+        """Get current system metrics (treat the returned dict as read-only)"""
         try:
-            # Check if cache is still valid
-            if time.time() - self.last_update > self.cache_ttl:
-                self._update_system_metrics()
-            
-            return self.metrics_cache.copy()
+            # The background thread rebinds metrics_cache to a new dict on
+            # each refresh, so handing out the current reference is safe
+            # without a per-call copy; callers must not mutate it
+            return self.metrics_cache
             
         except Exception as e:
             logger.error(f"Error getting system metrics: {str(e)}")
@@ -141,17 +200,35 @@ class MetricsCollector:
     def record_request(self, method: str, endpoint: str, status_code: int, duration: float):
         """Record HTTP request metrics"""
         try:
-            self.request_count.labels(
-                method=method, 
-                endpoint=endpoint, 
-                status_code=str(status_code)
-            ).inc()
-            
-            self.request_duration.labels(
-                method=method, 
-                endpoint=endpoint
-            ).observe(duration)
-            
+            count_key = (method, endpoint, status_code)
+            count_child = self._req_count_children.get(count_key)
+            if count_child is None:
+                if len(self._req_count_children) >= self._children_cap:
+                    self._req_count_children.clear()
+                count_child = self.request_count.labels(
+                    method=method,
+                    endpoint=endpoint,
+                    status_code=str(status_code)
+                )
+                self._req_count_children[count_key] = count_child
+            count_child.inc()
+
+            duration_key = (method, endpoint)
+            duration_child = self._req_duration_children.get(duration_key)
+            if duration_child is None:
+                if len(self._req_duration_children) >= self._children_cap:
+                    self._req_duration_children.clear()
+                duration_child = self.request_duration.labels(
+                    method=method,
+                    endpoint=endpoint
+                )
+                self._req_duration_children[duration_key] = duration_child
+            duration_child.observe(duration)
+
+            with self._agg_lock:
+                self._request_count_total += 1
+                self._request_duration_sum += duration
+
         except Exception as e:
             logger.error(f"Error recording request metrics: {str(e)}")
     
@@ -160,55 +237,47 @@ class MetricsCollector:
         try:
             # Record prediction count
             result_label = "effective" if prediction_result == 1 else "not_effective"
-            self.prediction_count.labels(prediction_result=result_label).inc()
+            prediction_child = self._prediction_children.get(result_label)
+            if prediction_child is None:
+                prediction_child = self.prediction_count.labels(prediction_result=result_label)
+                self._prediction_children[result_label] = prediction_child
+            prediction_child.inc()
             
             # Record inference time
             self.model_inference_time.observe(inference_time)
-            
+
+            with self._agg_lock:
+                self._prediction_count_total += 1
+                self._inference_time_sum += inference_time
+
         except Exception as e:
             logger.error(f"Error recording prediction metrics: {str(e)}")
     
     def get_application_metrics(self) -> Dict[str, Any]:
         """Get application-specific metrics"""
         try:
-            # Get Prometheus metric values
+            # Read the incrementally maintained aggregates; no collect()
+            # walk over label children and Sample objects
+            with self._agg_lock:
+                total_requests = self._request_count_total
+                request_duration_sum = self._request_duration_sum
+                total_predictions = self._prediction_count_total
+                inference_time_sum = self._inference_time_sum
+
             app_metrics = {
-                "total_requests": sum([
-                    sample.value for sample in self.request_count.collect()[0].samples
-                ]),
-                "total_predictions": sum([
-                    sample.value for sample in self.prediction_count.collect()[0].samples
-                ]),
-                "average_request_duration": self._get_histogram_average(self.request_duration),
-                "average_inference_time": self._get_histogram_average(self.model_inference_time),
+                "total_requests": total_requests,
+                "total_predictions": total_predictions,
+                "average_request_duration": request_duration_sum / total_requests if total_requests > 0 else 0,
+                "average_inference_time": inference_time_sum / total_predictions if total_predictions > 0 else 0,
                 "timestamp": time.time()
             }
-            
+
             return app_metrics
-            
+
         except Exception as e:
             logger.error(f"Error getting application metrics: {str(e)}")
             return {"error": "Unable to retrieve application metrics"}
     
-    def _get_histogram_average(self, histogram) -> float:
-        """Calculate average from Prometheus histogram"""
-        try:
-            samples = histogram.collect()[0].samples
-            total_sum = 0
-            total_count = 0
-            
-            for sample in samples:
-                if sample.name.endswith('_sum'):
-                    total_sum = sample.value
-                elif sample.name.endswith('_count'):
-                    total_count = sample.value
-            
-            return total_sum / total_count if total_count > 0 else 0
-            
-        except Exception as e:
-            logger.error(f"Error calculating histogram average: {str(e)}")
-            return 0
-    
     def get_comprehensive_metrics(self) -> Dict[str, Any]:
         """Get all metrics combined"""
         try:
@@ -230,5 +299,17 @@ class MetricsCollector:
                 "last_updated": time.time()
             }
 
-# Global metrics collector instance
-metrics_collector = MetricsCollector()
+# Lazily created process-wide collector: importing this module no longer
+# spins up the Prometheus server and sampling thread as a side effect
+_metrics_collector = None
+_collector_lock = threading.Lock()
+
+def get_metrics_collector() -> MetricsCollector:
+    """Return the shared metrics collector, creating it on first use"""
+    global _metrics_collector
+    if _metrics_collector is None:
+        with _collector_lock:
+            if _metrics_collector is None:
+                enable_server = os.getenv('METRICS_HTTP_SERVER', '1') == '1'
+                _metrics_collector = MetricsCollector(enable_prometheus_server=enable_server)
+    return _metrics_collector
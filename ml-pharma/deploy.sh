@@ -139,6 +139,15 @@ deploy_to_k8s() {
     kubectl apply -f k8s/namespace.yaml
     kubectl apply -f k8s/configmap.yaml
     kubectl apply -f k8s/secret.yaml
+
+    # One-shot Cosmos DB bootstrap (creates database/container/sentinel);
+    # the API pods skip resource creation, so this must complete first
+    print_status "Running Cosmos DB bootstrap job..."
+    kubectl delete job cosmos-bootstrap -n $NAMESPACE --ignore-not-found=true
+    kubectl apply -f k8s/cosmos-bootstrap-job.yaml
+    kubectl wait --for=condition=complete --timeout=120s job/cosmos-bootstrap -n $NAMESPACE
+    print_success "Cosmos DB resources bootstrapped"
+
     kubectl apply -f k8s/fastapi-deployment.yaml
     kubectl apply -f k8s/streamlit-deployment.yaml
     kubectl apply -f k8s/service.yaml
@@ -0,0 +1,17 @@
+import streamlit as st
+import httpx
+
+
+@st.cache_resource
+def get_http_session() -> httpx.Client:
+    """Shared HTTP client with connection pooling and HTTP/2 negotiation.
+
+    One client keeps connections to the API alive across reruns; HTTP/2
+    multiplexes the dashboard's parallel fetches over a single connection
+    when the server supports it, falling back to HTTP/1.1 otherwise.
+    """
+    return httpx.Client(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+    )
@@ -1,14 +1,191 @@
+from __future__ import annotations
+
 import streamlit as st
-import requests
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
+import orjson
+import numpy as np
 import time
+from bisect import bisect_right
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from streamlit_autorefresh import st_autorefresh
 from typing import Dict, Any, Optional
 import logging
 
+from components.http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
+# Cached fetch helpers, keyed on api_url: identical requests within the
+# TTL window are served from Streamlit's cache instead of hitting the API
+# again on every rerun. TTLs reflect how fast each payload actually moves
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _get_metrics(api_url: str) -> Optional[Dict[str, Any]]:
+    """Fetch the /metrics payload (cached for a few seconds)"""
+    response = get_http_session().get(f"{api_url}/metrics", timeout=10)
+    return orjson.loads(response.content) if response.status_code == 200 else None
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _get_prediction_stats(api_url: str) -> Optional[Dict[str, Any]]:
+    """Fetch the /predictions/stats payload (cached briefly)"""
+    response = get_http_session().get(f"{api_url}/predictions/stats", timeout=10)
+    return orjson.loads(response.content) if response.status_code == 200 else None
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _get_recent_predictions(api_url: str) -> Optional[Dict[str, Any]]:
+    """Fetch the recent predictions payload (cached briefly)"""
+    response = get_http_session().get(f"{api_url}/predictions/recent?limit=10", timeout=10)
+    return orjson.loads(response.content) if response.status_code == 200 else None
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_health(api_url: str) -> Optional[Dict[str, Any]]:
+    """Fetch the /health payload (cached longer; it rarely changes)"""
+    response = get_http_session().get(f"{api_url}/health", timeout=5)
+    return orjson.loads(response.content) if response.status_code == 200 else None
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _get_recent_predictions_frame(api_url: str) -> Optional[pd.DataFrame]:
+    """Fetch recent predictions over Arrow and format them vectorized"""
+    import pandas as pd
+
+    response = get_http_session().get(
+        f"{api_url}/predictions/recent.arrow?limit=10", timeout=10
+    )
+    if response.status_code != 200:
+        return None
+
+    raw = pd.read_feather(BytesIO(response.content))
+    if raw.empty:
+        return raw
+
+    # Column-wise formatting instead of a Python loop over rows
+    return pd.DataFrame({
+        'Timestamp': raw['timestamp'].str.slice(0, 19),  # Remove microseconds
+        'Prediction': np.where(raw['prediction'] == 1, '✅ Effective', '❌ Not Effective'),
+        'Probability': raw['probability'].map('{:.3f}'.format),
+        'Confidence': raw['confidence'].str.title()
+    })
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _get_dashboard_snapshot(api_url: str) -> Optional[Dict[str, Any]]:
+    """Fetch the aggregated dashboard snapshot in one round trip"""
+    response = get_http_session().get(f"{api_url}/dashboard-snapshot", timeout=10)
+    return orjson.loads(response.content) if response.status_code == 200 else None
+
+# Bytes per GiB, computed once for the byte-to-GB conversions
+_GIB = float(1 << 30)
+
+# Usage-percentage bands and their status emoji; bisect finds the band
+# in one lookup instead of re-evaluating chained ternaries per metric
+_STATUS_THRESHOLDS = (70, 85)
+_STATUS_EMOJI = ("🟢", "🟡", "🔴")
+
+def _status_emoji(percent: float) -> str:
+    """Status emoji for a usage percentage"""
+    return _STATUS_EMOJI[bisect_right(_STATUS_THRESHOLDS, percent)]
+
+# Gauge changes smaller than this are visually indistinguishable
+_RERENDER_THRESHOLD = 0.5
+
+def _dampened_value(key: str, value: float) -> float:
+    """Hold the previously rendered value while the change is sub-visible.
+
+    Returning the identical value keeps the figure cache key stable and
+    lets Streamlit's element diffing skip shipping a new chart for jitter.
+    """
+    last = st.session_state.get(key)
+    if last is not None and abs(value - last) < _RERENDER_THRESHOLD:
+        return last
+    st.session_state[key] = value
+    return value
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _gauge_figure_dict(value: float, title: str, bar_color: str) -> dict:
+    """Build a gauge figure as a plain dict, cached on the rounded value.
+
+    Figure construction is the slow part; caching the serialized dict and
+    rehydrating with go.Figure at render skips it while the value holds.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=value,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': title},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': bar_color},
+            'steps': [
+                {'range': [0, 50], 'color': "lightgray"},
+                {'range': [50, 80], 'color': "yellow"},
+                {'range': [80, 100], 'color': "red"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+    fig.update_layout(height=300)
+    return fig.to_dict()
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _effectiveness_pie_dict(effective: int, non_effective: int) -> dict:
+    """Build the effectiveness pie chart dict, cached on the counts"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[
+        go.Pie(
+            labels=['Effective', 'Not Effective'],
+            values=[effective, non_effective],
+            hole=0.3,
+            marker_colors=['#2E8B57', '#DC143C']
+        )
+    ])
+    fig.update_layout(
+        title="Treatment Effectiveness Distribution",
+        height=400
+    )
+    return fig.to_dict()
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _build_predictions_frame(rows: tuple) -> pd.DataFrame:
+    """Build the recent-predictions display frame, cached on the row content.
+
+    The rows tuple is hashable, so between data changes the formatting and
+    DataFrame construction run once instead of on every rerun.
+    """
+    import pandas as pd
+
+    records = [
+        (
+            timestamp[:19],  # Remove microseconds
+            '✅ Effective' if prediction == 1 else '❌ Not Effective',
+            f"{probability:.3f}",
+            confidence.title()
+        )
+        for timestamp, prediction, probability, confidence in rows
+    ]
+    return pd.DataFrame.from_records(
+        records,
+        columns=('Timestamp', 'Prediction', 'Probability', 'Confidence')
+    )
+
+@st.cache_resource
+def get_metrics_dashboard(api_url: str) -> "MetricsDashboard":
+    """Shared dashboard instance per API URL, reused across reruns"""
+    return MetricsDashboard(api_url=api_url)
+
+def _clear_fetch_caches():
+    """Drop all cached payloads so the next render refetches"""
+    _get_dashboard_snapshot.clear()
+    _get_metrics.clear()
+    _get_prediction_stats.clear()
+    _get_recent_predictions.clear()
+    _get_health.clear()
+
 class MetricsDashboard:
     def __init__(self, api_url: str = "http://localhost:8000"):
         self.api_url = api_url
@@ -29,179 +206,202 @@ class MetricsDashboard:
         
         with col3:
             if st.button("🔄 Refresh Now", use_container_width=True):
+                _clear_fetch_caches()
                 st.rerun()
         
-        # Auto-refresh logic
+        # Auto-refresh via a client-side timer; the old sleep+rerun loop
+        # kept the server thread busy for the full 5 seconds
         if auto_refresh:
-            time.sleep(5)
-            st.rerun()
+            st_autorefresh(interval=5000, key="metrics_refresh")
         
-        # Fetch and display metrics
+        # Fetch everything up front, then hand the payloads to pure
+        # display methods
         try:
-            self._display_system_metrics()
-            self._display_application_metrics()
-            self._display_prediction_statistics()
-            
+            payloads = self._fetch_all()
+            self._display_system_metrics(payloads.get("metrics"))
+            self._display_application_metrics(payloads.get("metrics"))
+            self._display_prediction_statistics(payloads.get("stats"), payloads.get("recent"))
+
         except Exception as e:
             st.error(f"Error loading metrics: {str(e)}")
             logger.error(f"Metrics dashboard error: {str(e)}")
-    
-    def _display_system_metrics(self):
-        """Display system performance metrics"""
-        st.subheader("🖥️ System Performance")
-        
+
+    def _fetch_all(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch all dashboard payloads concurrently"""
+        # Preferred path: poll the aggregate snapshot endpoint through the
+        # ttl cache, so reruns within the window share one request. The
+        # /dashboard-stream SSE endpoint stays available for persistent
+        # consumers, but opening a stream per rerun costs more than the
+        # cached poll
+        payloads = None
         try:
-            # Fetch metrics from API
-            response = requests.get(f"{self.api_url}/metrics", timeout=10)
-            
-            if response.status_code == 200:
-                metrics_data = response.json()
-                system_metrics = metrics_data.get("system", {})
-                
-                if system_metrics and not system_metrics.get("error"):
-                    self._render_system_metrics_charts(system_metrics)
-                else:
-                    st.warning("System metrics not available")
+            snapshot = _get_dashboard_snapshot(self.api_url)
+            if snapshot is not None:
+                st.session_state["_dashboard_snapshot"] = snapshot
             else:
-                st.error(f"Failed to fetch metrics: {response.status_code}")
-                
-        except requests.exceptions.RequestException:
-            st.error("Unable to connect to the metrics API. Please ensure the FastAPI service is running.")
+                snapshot = st.session_state.get("_dashboard_snapshot")
+            if snapshot is not None:
+                payloads = {
+                    "metrics": snapshot.get("metrics"),
+                    "stats": snapshot.get("stats"),
+                    "recent": snapshot.get("recent"),
+                    "health": snapshot.get("health")
+                }
         except Exception as e:
-            st.error(f"Error fetching system metrics: {str(e)}")
+            logger.error(f"Error fetching dashboard snapshot: {str(e)}")
+
+        # Fallback for APIs without the snapshot endpoint: fetch the four
+        # payloads concurrently as before
+        if payloads is None:
+            fetchers = {
+                "metrics": _get_metrics,
+                "stats": _get_prediction_stats,
+                "recent": _get_recent_predictions,
+                "health": _get_health
+            }
+            payloads = {}
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = {
+                    name: pool.submit(fetcher, self.api_url)
+                    for name, fetcher in fetchers.items()
+                }
+                for name, future in futures.items():
+                    try:
+                        payloads[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching {name}: {str(e)}")
+                        payloads[name] = None
+
+        # Stale fallback: when a fetch fails, reuse the last good payload
+        # from session state instead of blanking that section
+        last_good = st.session_state.setdefault("_dashboard_last_good", {})
+        stale_since = None
+        for name, payload in payloads.items():
+            if payload is not None:
+                last_good[name] = (payload, time.time())
+            elif name in last_good:
+                payload, fetched_at = last_good[name]
+                payloads[name] = payload
+                stale_since = fetched_at if stale_since is None else min(stale_since, fetched_at)
+
+        if stale_since is not None:
+            st.caption(
+                f"⚠️ API unreachable — showing data last updated at "
+                f"{time.strftime('%H:%M:%S', time.localtime(stale_since))}"
+            )
+
+        return payloads
+
+    def _display_system_metrics(self, metrics_data: Optional[Dict[str, Any]]):
+        """Display system performance metrics"""
+        st.subheader("🖥️ System Performance")
+
+        if metrics_data is None:
+            st.error("Unable to connect to the metrics API. Please ensure the FastAPI service is running.")
+            return
+
+        system_metrics = metrics_data.get("system", {})
+        if system_metrics and not system_metrics.get("error"):
+            self._render_system_metrics_charts(system_metrics)
+        else:
+            st.warning("System metrics not available")
     
     def _render_system_metrics_charts(self, metrics: Dict[str, Any]):
         """Render system metrics charts"""
+        # Deferred so importing the module doesn't pay for plotly
+        import plotly.graph_objects as go
+
+        # Destructure the payload once; the sections below reuse the
+        # locals instead of repeating dict lookups
+        cpu_usage = metrics.get("cpu_usage_percent", 0)
+        memory_percent = metrics.get("memory_usage_percent", 0)
+        disk_usage = metrics.get("disk_usage_percent", 0)
+        memory_used_gb = metrics.get("memory_usage_bytes", 0) / _GIB
+
         # Key metrics row
         col1, col2, col3, col4 = st.columns(4)
-        
+
         with col1:
-            cpu_usage = metrics.get("cpu_usage_percent", 0)
-            delta_color = "normal" if cpu_usage < 70 else "inverse"
             st.metric(
                 label="CPU Usage",
                 value=f"{cpu_usage:.1f}%",
-                delta=f"{'🟢' if cpu_usage < 70 else '🟡' if cpu_usage < 85 else '🔴'}"
+                delta=_status_emoji(cpu_usage)
             )
-        
+
         with col2:
-            memory_percent = metrics.get("memory_usage_percent", 0)
             st.metric(
                 label="Memory Usage",
                 value=f"{memory_percent:.1f}%",
-                delta=f"{'🟢' if memory_percent < 70 else '🟡' if memory_percent < 85 else '🔴'}"
+                delta=_status_emoji(memory_percent)
             )
-        
+
         with col3:
-            disk_usage = metrics.get("disk_usage_percent", 0)
             st.metric(
                 label="Disk Usage",
                 value=f"{disk_usage:.1f}%",
-                delta=f"{'🟢' if disk_usage < 70 else '🟡' if disk_usage < 85 else '🔴'}"
+                delta=_status_emoji(disk_usage)
             )
-        
+
         with col4:
-            # Convert bytes to GB for memory
-            memory_used_gb = metrics.get("memory_usage_bytes", 0) / (1024**3)
             st.metric(
                 label="Memory Used",
                 value=f"{memory_used_gb:.2f} GB"
             )
-        
+
         # Detailed charts
         col1, col2 = st.columns(2)
-        
+
         with col1:
-            # CPU Usage Gauge
-            fig_cpu = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=metrics.get("cpu_usage_percent", 0),
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "CPU Usage (%)"},
-                gauge={
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 50], 'color': "lightgray"},
-                        {'range': [50, 80], 'color': "yellow"},
-                        {'range': [80, 100], 'color': "red"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90
-                    }
-                }
-            ))
-            fig_cpu.update_layout(height=300)
-            st.plotly_chart(fig_cpu, use_container_width=True)
-        
+            # CPU Usage Gauge; sub-threshold jitter keeps the previous
+            # value so neither the figure cache nor the frontend redraws
+            cpu_value = _dampened_value("_gauge_cpu", round(cpu_usage, 1))
+            fig_dict = _gauge_figure_dict(cpu_value, "CPU Usage (%)", "darkblue")
+            st.plotly_chart(go.Figure(fig_dict), use_container_width=True)
+
         with col2:
             # Memory Usage Gauge
-            fig_memory = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=metrics.get("memory_usage_percent", 0),
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "Memory Usage (%)"},
-                gauge={
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "green"},
-                    'steps': [
-                        {'range': [0, 50], 'color': "lightgray"},
-                        {'range': [50, 80], 'color': "yellow"},
-                        {'range': [80, 100], 'color': "red"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90
-                    }
-                }
-            ))
-            fig_memory.update_layout(height=300)
-            st.plotly_chart(fig_memory, use_container_width=True)
+            memory_value = _dampened_value("_gauge_memory", round(memory_percent, 1))
+            fig_dict = _gauge_figure_dict(memory_value, "Memory Usage (%)", "green")
+            st.plotly_chart(go.Figure(fig_dict), use_container_width=True)
         
         # System information
         with st.expander("📋 Detailed System Information"):
+            # All byte fields converted in one pass
+            gb = {
+                field: metrics.get(f"{field}_bytes", 0) / _GIB
+                for field in (
+                    "memory_total", "memory_available", "memory_usage",
+                    "disk_total", "disk_free", "disk_used"
+                )
+            }
+
             col1, col2 = st.columns(2)
-            
+
             with col1:
                 st.markdown("**Memory Details:**")
-                memory_total_gb = metrics.get("memory_total_bytes", 0) / (1024**3)
-                memory_available_gb = metrics.get("memory_available_bytes", 0) / (1024**3)
-                st.write(f"• Total: {memory_total_gb:.2f} GB")
-                st.write(f"• Available: {memory_available_gb:.2f} GB")
-                st.write(f"• Used: {memory_used_gb:.2f} GB")
-            
+                st.write(f"• Total: {gb['memory_total']:.2f} GB")
+                st.write(f"• Available: {gb['memory_available']:.2f} GB")
+                st.write(f"• Used: {gb['memory_usage']:.2f} GB")
+
             with col2:
                 st.markdown("**Disk Details:**")
-                disk_total_gb = metrics.get("disk_total_bytes", 0) / (1024**3)
-                disk_free_gb = metrics.get("disk_free_bytes", 0) / (1024**3)
-                disk_used_gb = metrics.get("disk_used_bytes", 0) / (1024**3)
-                st.write(f"• Total: {disk_total_gb:.2f} GB")
-                st.write(f"• Free: {disk_free_gb:.2f} GB")
-                st.write(f"• Used: {disk_used_gb:.2f} GB")
+                st.write(f"• Total: {gb['disk_total']:.2f} GB")
+                st.write(f"• Free: {gb['disk_free']:.2f} GB")
+                st.write(f"• Used: {gb['disk_used']:.2f} GB")
     
-    def _display_application_metrics(self):
+    def _display_application_metrics(self, metrics_data: Optional[Dict[str, Any]]):
         """Display application-specific metrics"""
         st.subheader("🚀 Application Performance")
-        
-        try:
-            response = requests.get(f"{self.api_url}/metrics", timeout=10)
-            
-            if response.status_code == 200:
-                metrics_data = response.json()
-                app_metrics = metrics_data.get("application", {})
-                
-                if app_metrics and not app_metrics.get("error"):
-                    self._render_application_metrics(app_metrics)
-                else:
-                    st.info("Application metrics will be available after some API usage")
-            else:
-                st.warning("Application metrics not available")
-                
-        except Exception as e:
+
+        if metrics_data is None:
             st.warning("Application metrics not available")
+            return
+
+        app_metrics = metrics_data.get("application", {})
+        if app_metrics and not app_metrics.get("error"):
+            self._render_application_metrics(app_metrics)
+        else:
+            st.info("Application metrics will be available after some API usage")
     
     def _render_application_metrics(self, metrics: Dict[str, Any]):
         """Render application metrics"""
@@ -233,122 +433,109 @@ class MetricsDashboard:
                 value=f"{avg_inference_time:.3f}s"
             )
     
-    def _display_prediction_statistics(self):
+    def _display_prediction_statistics(self, stats: Optional[Dict[str, Any]], recent: Optional[Dict[str, Any]]):
         """Display prediction statistics from database"""
         st.subheader("📈 Prediction Analytics")
-        
-        try:
-            # Fetch prediction statistics
-            response = requests.get(f"{self.api_url}/predictions/stats", timeout=10)
-            
-            if response.status_code == 200:
-                stats = response.json()
-                
-                if stats:
-                    self._render_prediction_stats(stats)
-                else:
-                    st.info("No prediction data available yet. Make some predictions to see statistics.")
-            else:
-                st.info("Prediction statistics not available")
-                
-        except Exception as e:
-            st.info("Prediction statistics will be available after database connection is established")
-    
-    def _render_prediction_stats(self, stats: Dict[str, Any]):
+
+        if stats:
+            self._render_prediction_stats(stats, recent)
+        elif stats is not None:
+            st.info("No prediction data available yet. Make some predictions to see statistics.")
+        else:
+            st.info("Prediction statistics not available")
+
+    def _render_prediction_stats(self, stats: Dict[str, Any], recent: Optional[Dict[str, Any]] = None):
         """Render prediction statistics"""
+        import plotly.graph_objects as go
+
+        # Destructure the payload once up front
+        total_predictions = stats.get('total_predictions', 0)
+        effective_predictions = stats.get('effective_predictions', 0)
+        non_effective_predictions = stats.get('non_effective_predictions', 0)
+        effectiveness_rate = stats.get('effectiveness_rate', 0)
+
         col1, col2, col3, col4 = st.columns(4)
-        
+
         with col1:
             st.metric(
                 label="Total Predictions",
-                value=f"{stats.get('total_predictions', 0)}"
+                value=f"{total_predictions}"
             )
-        
+
         with col2:
             st.metric(
                 label="Effective Treatments",
-                value=f"{stats.get('effective_predictions', 0)}"
+                value=f"{effective_predictions}"
             )
-        
+
         with col3:
             st.metric(
                 label="Non-Effective Treatments",
-                value=f"{stats.get('non_effective_predictions', 0)}"
+                value=f"{non_effective_predictions}"
             )
-        
+
         with col4:
-            effectiveness_rate = stats.get('effectiveness_rate', 0)
             st.metric(
                 label="Effectiveness Rate",
                 value=f"{effectiveness_rate:.1f}%"
             )
-        
+
         # Effectiveness distribution chart
-        if stats.get('total_predictions', 0) > 0:
-            fig = go.Figure(data=[
-                go.Pie(
-                    labels=['Effective', 'Not Effective'],
-                    values=[
-                        stats.get('effective_predictions', 0),
-                        stats.get('non_effective_predictions', 0)
-                    ],
-                    hole=0.3,
-                    marker_colors=['#2E8B57', '#DC143C']
-                )
-            ])
-            
-            fig.update_layout(
-                title="Treatment Effectiveness Distribution",
-                height=400
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        if total_predictions > 0:
+            fig_dict = _effectiveness_pie_dict(effective_predictions, non_effective_predictions)
+            st.plotly_chart(go.Figure(fig_dict), use_container_width=True)
         
         # Recent predictions
-        self._display_recent_predictions()
-    
-    def _display_recent_predictions(self):
+        self._display_recent_predictions(recent)
+
+    def _display_recent_predictions(self, data: Optional[Dict[str, Any]]):
         """Display recent predictions table"""
-        try:
-            response = requests.get(f"{self.api_url}/predictions/recent?limit=10", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                predictions = data.get('predictions', [])
-                
-                if predictions:
+        predictions = data.get('predictions') if data else None
+
+        # Only hit the Arrow endpoint when the combined snapshot didn't
+        # already deliver the rows; otherwise that's an extra round trip
+        # for data we're holding
+        if predictions is None:
+            try:
+                df = _get_recent_predictions_frame(self.api_url)
+            except Exception as e:
+                logger.error(f"Error fetching Arrow predictions: {str(e)}")
+                df = None
+
+            if df is not None:
+                if not df.empty:
                     st.markdown("**Recent Predictions:**")
-                    
-                    # Prepare data for display
-                    display_data = []
-                    for pred in predictions:
-                        display_data.append({
-                            'Timestamp': pred.get('timestamp', 'N/A')[:19],  # Remove microseconds
-                            'Prediction': '✅ Effective' if pred.get('prediction') == 1 else '❌ Not Effective',
-                            'Probability': f"{pred.get('probability', 0):.3f}",
-                            'Confidence': pred.get('confidence', 'unknown').title()
-                        })
-                    
-                    df = pd.DataFrame(display_data)
                     st.dataframe(df, use_container_width=True, hide_index=True)
                 else:
                     st.info("No recent predictions available")
-            
-        except Exception as e:
-            logger.error(f"Error fetching recent predictions: {str(e)}")
-    
-    def _render_status_indicators(self):
+                return
+            predictions = []
+
+        if predictions:
+            st.markdown("**Recent Predictions:**")
+
+            # Project to an immutable tuple so the frame build is cacheable
+            rows = tuple(
+                (
+                    pred.get('timestamp', 'N/A'),
+                    pred.get('prediction'),
+                    pred.get('probability', 0),
+                    pred.get('confidence', 'unknown')
+                )
+                for pred in predictions
+            )
+            df = _build_predictions_frame(rows)
+            st.dataframe(df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No recent predictions available")
+
+    def _render_status_indicators(self, health_data: Optional[Dict[str, Any]]):
         """Render system status indicators"""
         st.markdown("---")
         st.subheader("🔧 System Status")
-        
+
         try:
-            # Check API health
-            response = requests.get(f"{self.api_url}/health", timeout=5)
-            
-            if response.status_code == 200:
-                health_data = response.json()
-                
+            if health_data:
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
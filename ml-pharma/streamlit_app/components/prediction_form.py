@@ -1,83 +1,138 @@
 import streamlit as st
-import requests
-import json
+import httpx
+import operator
+import orjson
 from typing import Dict, Any, Optional
 import logging
 
+from components.http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
+# Confidence level to status emoji, replacing chained ternaries at render
+_CONFIDENCE_EMOJI = {"high": "🟢", "medium": "🟡", "low": "🔴"}
+
+@st.cache_resource
+def get_prediction_form(api_url: str) -> "PredictionForm":
+    """Shared form instance per API URL, reused across reruns"""
+    return PredictionForm(api_url=api_url)
+
 class PredictionForm:
+    # Feature definitions with descriptions and ranges; shared by every
+    # instance, so the dict is built once at class load instead of per
+    # form construction
+    FEATURE_CONFIG = {
+        "drug_concentration": {
+            "label": "Drug Concentration (mg/mL)",
+            "min_value": 5.0,
+            "max_value": 15.0,
+            "default": 10.0,
+            "step": 0.1,
+            "help": "Concentration of the active pharmaceutical ingredient"
+        },
+        "patient_age": {
+            "label": "Patient Age (years)",
+            "min_value": 18,
+            "max_value": 80,
+            "default": 45,
+            "step": 1,
+            "help": "Age of the patient receiving treatment"
+        },
+        "patient_weight": {
+            "label": "Patient Weight (kg)",
+            "min_value": 40.0,
+            "max_value": 120.0,
+            "default": 70.0,
+            "step": 0.5,
+            "help": "Patient body weight in kilograms"
+        },
+        "dosage_mg": {
+            "label": "Drug Dosage (mg)",
+            "min_value": 100.0,
+            "max_value": 1000.0,
+            "default": 500.0,
+            "step": 10.0,
+            "help": "Total drug dosage in milligrams"
+        },
+        "treatment_duration_days": {
+            "label": "Treatment Duration (days)",
+            "min_value": 1,
+            "max_value": 180,
+            "default": 30,
+            "step": 1,
+            "help": "Duration of the treatment period"
+        },
+        "biomarker_level": {
+            "label": "Biomarker Level",
+            "min_value": 1.0,
+            "max_value": 10.0,
+            "default": 5.0,
+            "step": 0.1,
+            "help": "Relevant biomarker measurement"
+        },
+        "liver_function_score": {
+            "label": "Liver Function Score",
+            "min_value": 0.1,
+            "max_value": 1.0,
+            "default": 0.8,
+            "step": 0.01,
+            "help": "Liver function assessment (0-1 scale)"
+        },
+        "kidney_function_score": {
+            "label": "Kidney Function Score",
+            "min_value": 0.1,
+            "max_value": 1.0,
+            "default": 0.8,
+            "step": 0.01,
+            "help": "Kidney function assessment (0-1 scale)"
+        }
+    }
+
+    # Layout derived once from the config: names in order and the split
+    # between the two form columns
+    _FEATURE_NAMES = tuple(FEATURE_CONFIG.keys())
+    _MID_POINT = len(_FEATURE_NAMES) // 2
+    _LEFT_FEATURES = _FEATURE_NAMES[:_MID_POINT]
+    _RIGHT_FEATURES = _FEATURE_NAMES[_MID_POINT:]
+
+    # number_input kwargs with the int/float casting resolved once at
+    # class load; the per-widget type branch disappears from render
+    _INPUT_KWARGS = {
+        name: {
+            "label": cfg["label"],
+            "min_value": cfg["min_value"] if isinstance(cfg["default"], int) else float(cfg["min_value"]),
+            "max_value": cfg["max_value"] if isinstance(cfg["default"], int) else float(cfg["max_value"]),
+            "value": cfg["default"] if isinstance(cfg["default"], int) else float(cfg["default"]),
+            "step": cfg["step"] if isinstance(cfg["default"], int) else float(cfg["step"]),
+            "help": cfg["help"]
+        }
+        for name, cfg in FEATURE_CONFIG.items()
+    }
+
+    # Parameter advisory rules as (feature, comparison, threshold, message);
+    # recommendations fall out of one pass over the table
+    _RULES = (
+        ("drug_concentration", operator.lt, 8.0,
+         "Consider increasing drug concentration for better efficacy"),
+        ("drug_concentration", operator.gt, 12.0,
+         "Monitor for potential side effects due to high drug concentration"),
+        ("patient_age", operator.gt, 65,
+         "Consider age-related dose adjustments and closer monitoring"),
+        ("patient_age", operator.lt, 30,
+         "Monitor for different response patterns in younger patients"),
+        ("dosage_mg", operator.lt, 300,
+         "Consider if current dosage is sufficient for therapeutic effect"),
+        ("dosage_mg", operator.gt, 700,
+         "Monitor for dose-related adverse effects"),
+        ("liver_function_score", operator.lt, 0.7,
+         "Consider dose adjustment due to reduced liver function"),
+        ("kidney_function_score", operator.lt, 0.7,
+         "Consider dose adjustment due to reduced kidney function")
+    )
+
     def __init__(self, api_url: str = "http://localhost:8000"):
         self.api_url = api_url
-        
-        # Feature definitions with descriptions and ranges
-        self.feature_config = {
-            "drug_concentration": {
-                "label": "Drug Concentration (mg/mL)",
-                "min_value": 5.0,
-                "max_value": 15.0,
-                "default": 10.0,
-                "step": 0.1,
-                "help": "Concentration of the active pharmaceutical ingredient"
-            },
-            "patient_age": {
-                "label": "Patient Age (years)",
-                "min_value": 18,
-                "max_value": 80,
-                "default": 45,
-                "step": 1,
-                "help": "Age of the patient receiving treatment"
-            },
-            "patient_weight": {
-                "label": "Patient Weight (kg)",
-                "min_value": 40.0,
-                "max_value": 120.0,
-                "default": 70.0,
-                "step": 0.5,
-                "help": "Patient body weight in kilograms"
-            },
-            "dosage_mg": {
-                "label": "Drug Dosage (mg)",
-                "min_value": 100.0,
-                "max_value": 1000.0,
-                "default": 500.0,
-                "step": 10.0,
-                "help": "Total drug dosage in milligrams"
-            },
-            "treatment_duration_days": {
-                "label": "Treatment Duration (days)",
-                "min_value": 1,
-                "max_value": 180,
-                "default": 30,
-                "step": 1,
-                "help": "Duration of the treatment period"
-            },
-            "biomarker_level": {
-                "label": "Biomarker Level",
-                "min_value": 1.0,
-                "max_value": 10.0,
-                "default": 5.0,
-                "step": 0.1,
-                "help": "Relevant biomarker measurement"
-            },
-            "liver_function_score": {
-                "label": "Liver Function Score",
-                "min_value": 0.1,
-                "max_value": 1.0,
-                "default": 0.8,
-                "step": 0.01,
-                "help": "Liver function assessment (0-1 scale)"
-            },
-            "kidney_function_score": {
-                "label": "Kidney Function Score",
-                "min_value": 0.1,
-                "max_value": 1.0,
-                "default": 0.8,
-                "step": 0.01,
-                "help": "Kidney function assessment (0-1 scale)"
-            }
-        }
-    
+
     def render(self):
         """Render the prediction form"""
         st.header("🔬 Treatment Effectiveness Prediction")
@@ -92,81 +147,44 @@ class PredictionForm:
             
             # Collect feature values
             feature_values = {}
-            
-            feature_names = list(self.feature_config.keys())
-            mid_point = len(feature_names) // 2
-            
+
             # First column
             with col1:
-                for feature_name in feature_names[:mid_point]:
-                    config = self.feature_config[feature_name]
-                    
-                    if isinstance(config["default"], int):
-                        value = st.number_input(
-                            config["label"],
-                            min_value=config["min_value"],
-                            max_value=config["max_value"],
-                            value=config["default"],
-                            step=config["step"],
-                            help=config["help"]
-                        )
-                    else:
-                        value = st.number_input(
-                            config["label"],
-                            min_value=float(config["min_value"]),
-                            max_value=float(config["max_value"]),
-                            value=float(config["default"]),
-                            step=float(config["step"]),
-                            help=config["help"]
-                        )
-                    
-                    feature_values[feature_name] = float(value)
-            
+                for feature_name in self._LEFT_FEATURES:
+                    feature_values[feature_name] = self._render_feature(feature_name)
+
             # Second column
             with col2:
-                for feature_name in feature_names[mid_point:]:
-                    config = self.feature_config[feature_name]
-                    
-                    if isinstance(config["default"], int):
-                        value = st.number_input(
-                            config["label"],
-                            min_value=config["min_value"],
-                            max_value=config["max_value"],
-                            value=config["default"],
-                            step=config["step"],
-                            help=config["help"]
-                        )
-                    else:
-                        value = st.number_input(
-                            config["label"],
-                            min_value=float(config["min_value"]),
-                            max_value=float(config["max_value"]),
-                            value=float(config["default"]),
-                            step=float(config["step"]),
-                            help=config["help"]
-                        )
-                    
-                    feature_values[feature_name] = float(value)
-            
+                for feature_name in self._RIGHT_FEATURES:
+                    feature_values[feature_name] = self._render_feature(feature_name)
+
+
             # Submit button
             submitted = st.form_submit_button("🔍 Predict Treatment Effectiveness", use_container_width=True)
             
             if submitted:
                 self._make_prediction(feature_values)
-    
+
+    def _render_feature(self, feature_name: str) -> float:
+        """Render the number input for one feature"""
+        return float(st.number_input(**self._INPUT_KWARGS[feature_name]))
+
+
     def _make_prediction(self, feature_values: Dict[str, float]):
         """Make prediction API call and display results"""
         try:
             # Show loading spinner
             with st.spinner("Analyzing treatment parameters..."):
-                # Prepare API request
-                features = [feature_values[name] for name in self.feature_config.keys()]
-                payload = {"features": features}
-                
-                # Make API call
-                response = requests.post(
+                # Prepare API request; the feature order is fixed by the
+                # class-level tuple, matching what the model was trained on
+                features = [feature_values[name] for name in self._FEATURE_NAMES]
+
+                # Make API call; orjson serializes the payload faster than
+                # the stdlib encoder requests would use
+                response = get_http_session().post(
                     f"{self.api_url}/predict",
-                    json=payload,
+                    content=orjson.dumps({"features": features}),
+                    headers={"Content-Type": "application/json"},
                     timeout=30
                 )
                 
@@ -176,7 +194,7 @@ class PredictionForm:
                     error_detail = response.json().get("detail", "Unknown error")
                     st.error(f"Prediction failed: {error_detail}")
                     
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             st.error(f"Connection error: Unable to connect to the ML API. Please check if the service is running.")
             logger.error(f"API connection error: {str(e)}")
         except Exception as e:
@@ -207,7 +225,7 @@ class PredictionForm:
             st.metric("Confidence", probability * 100, f"{confidence.upper()}")
         
         with col3:
-            confidence_color = "🟢" if confidence == "high" else "🟡" if confidence == "medium" else "🔴"
+            confidence_color = _CONFIDENCE_EMOJI.get(confidence, "🔴")
             st.metric("Confidence Level", f"{confidence_color} {confidence.title()}")
         
         # Detailed interpretation
@@ -226,7 +244,7 @@ class PredictionForm:
             with col2:
                 st.markdown("**Input Parameters:**")
                 for feature_name, value in feature_values.items():
-                    config = self.feature_config[feature_name]
+                    config = self.FEATURE_CONFIG[feature_name]
                     st.write(f"• {config['label']}: {value}")
         
         # Recommendation section
@@ -278,31 +296,8 @@ class PredictionForm:
     
     def _get_parameter_recommendations(self, feature_values: Dict[str, float]) -> list:
         """Generate parameter-specific recommendations"""
-        recommendations = []
-        
-        # Drug concentration recommendations
-        if feature_values["drug_concentration"] < 8.0:
-            recommendations.append("Consider increasing drug concentration for better efficacy")
-        elif feature_values["drug_concentration"] > 12.0:
-            recommendations.append("Monitor for potential side effects due to high drug concentration")
-        
-        # Age-related recommendations
-        if feature_values["patient_age"] > 65:
-            recommendations.append("Consider age-related dose adjustments and closer monitoring")
-        elif feature_values["patient_age"] < 30:
-            recommendations.append("Monitor for different response patterns in younger patients")
-        
-        # Dosage recommendations
-        if feature_values["dosage_mg"] < 300:
-            recommendations.append("Consider if current dosage is sufficient for therapeutic effect")
-        elif feature_values["dosage_mg"] > 700:
-            recommendations.append("Monitor for dose-related adverse effects")
-        
-        # Organ function recommendations
-        if feature_values["liver_function_score"] < 0.7:
-            recommendations.append("Consider dose adjustment due to reduced liver function")
-        
-        if feature_values["kidney_function_score"] < 0.7:
-            recommendations.append("Consider dose adjustment due to reduced kidney function")
-        
-        return recommendations
+        return [
+            message
+            for feature, compare, threshold, message in self._RULES
+            if compare(feature_values[feature], threshold)
+        ]
@@ -1,9 +1,11 @@
 import streamlit as st
-import requests
+import httpx
+import orjson
 import os
+import time
 import logging
-from components.prediction_form import PredictionForm
-from components.metrics_dashboard import MetricsDashboard
+from concurrent.futures import ThreadPoolExecutor
+from components.http_client import get_http_session
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,8 +24,12 @@ st.set_page_config(
     }
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS for better styling; theme colors live in
+# .streamlit/config.toml, only layout tweaks remain inline
+@st.cache_data(show_spinner=False)
+def _app_css():
+    """Static page CSS, built once and reused across reruns"""
+    return """
 <style>
     .main-header {
         font-size: 3rem;
@@ -70,126 +76,326 @@ st.markdown("""
         color: #721c24;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_app_css(), unsafe_allow_html=True)
 
 def get_api_url():
-    """Get API URL from environment or use default"""
-    return os.getenv('API_URL', 'http://localhost:8000')
+    """Get the API URL, resolved once per session into session state"""
+    return st.session_state.setdefault(
+        "api_url", os.getenv('API_URL', 'http://localhost:8000')
+    )
 
-def check_api_status():
-    """Check if the FastAPI backend is accessible"""
-    api_url = get_api_url()
+# Cached fetch helpers keyed on api_url; reruns within the TTL reuse the
+# cached payload instead of hitting the API again
+
+# Short connect timeout so a dead backend fails fast (~0.5s) instead of
+# stalling the rerun for the full read timeout; the health cache TTL then
+# keeps the negative result from re-probing on every rerun
+_HEALTH_TIMEOUT = httpx.Timeout(2.0, connect=0.5)
+
+# When each URL was last actually probed (module-level rather than
+# session state because the prefetch pool calls the fetcher from worker
+# threads that have no script context)
+_last_health_probe = {}
+
+# Log at most one health-check failure per window per URL so a dead
+# backend doesn't flood container stdout on every retry
+_ERROR_LOG_WINDOW = 15
+_last_error_log = {}
+
+def _log_health_failure(api_url, error):
+    """Log a health-check failure, throttled to one per window per URL"""
+    now = time.time()
+    if now - _last_error_log.get(api_url, 0.0) >= _ERROR_LOG_WINDOW:
+        _last_error_log[api_url] = now
+        logger.error(f"API health check failed: {str(error)}")
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _fetch_sidebar(api_url):
+    """Fetch /sidebar: health, model and feature info in one round-trip.
+
+    Returns None when the endpoint is missing (older backend) or
+    unreachable, in which case the per-endpoint fetchers fall back to
+    their own requests.
+    """
+    _last_health_probe[api_url] = time.time()
+    try:
+        response = get_http_session().get(f"{api_url}/sidebar", timeout=_HEALTH_TIMEOUT)
+        if response.status_code != 200:
+            return None
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return None
+    except Exception as e:
+        _log_health_failure(api_url, e)
+        return None
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _fetch_health(api_url):
+    """Fetch the /health payload, or None when unreachable.
+
+    Cached for 15s, so reruns within the TTL reuse one probe; the probe
+    time is recorded so the sidebar can show how stale the status is.
+    """
+    sidebar = _fetch_sidebar(api_url)
+    if sidebar is not None:
+        return sidebar.get("health")
+    _last_health_probe[api_url] = time.time()
+    try:
+        response = get_http_session().get(f"{api_url}/health", timeout=_HEALTH_TIMEOUT)
+        if response.status_code != 200:
+            return None
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return None
+    except Exception as e:
+        _log_health_failure(api_url, e)
+        return None
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_model_info(api_url):
+    """Fetch /model/info; the model only changes on retrain/redeploy"""
+    sidebar = _fetch_sidebar(api_url)
+    if sidebar is not None:
+        return sidebar.get("model")
     try:
-        response = requests.get(f"{api_url}/health", timeout=5)
-        return response.status_code == 200, response.json() if response.status_code == 200 else None
+        response = get_http_session().get(f"{api_url}/model/info", timeout=5)
+        if response.status_code != 200:
+            return None
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return None
     except Exception as e:
-        logger.error(f"API health check failed: {str(e)}")
-        return False, None
+        logger.error(f"Error fetching model info: {str(e)}")
+        return None
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_feature_info(api_url):
+    """Fetch /model/features as pre-formatted (label, description) rows.
+
+    The descriptions are effectively static, so the display labels are
+    computed once here and served from the cache on every rerun.
+    """
+    sidebar = _fetch_sidebar(api_url)
+    if sidebar is not None:
+        data = sidebar.get("features")
+        return _format_feature_rows(data) if data is not None else None
+    try:
+        response = get_http_session().get(f"{api_url}/model/features", timeout=5)
+        if response.status_code != 200:
+            return None
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return None
+        return _format_feature_rows(data)
+    except Exception as e:
+        logger.error(f"Error fetching feature info: {str(e)}")
+        return None
+
+def _format_feature_rows(feature_info):
+    """Turn a raw feature-info payload into (label, description) rows"""
+    return [
+        (feature.replace('_', ' ').title(), description)
+        for feature, description in feature_info.get('feature_descriptions', {}).items()
+    ]
+
+def check_api_status():
+    """Check if the FastAPI backend is accessible"""
+    health_data = _fetch_health(get_api_url())
+    return health_data is not None, health_data
+
+def _prefetch_sidebar(api_url):
+    """Fetch the three sidebar payloads concurrently.
+
+    The endpoints are independent, so the sidebar waits for the slowest
+    response rather than the sum of all three; cached payloads return
+    immediately.
+    """
+    # Warm the combined endpoint first; when it exists the individual
+    # fetchers below just slice its cached payload
+    _fetch_sidebar(api_url)
+
+    fetchers = {"health": _fetch_health}
+    # Model/feature info is only rendered when its toggle is on, so only
+    # warm those caches when the user will actually see the payload
+    if st.session_state.get("show_model_info"):
+        fetchers["model"] = _fetch_model_info
+    if st.session_state.get("show_feature_info"):
+        fetchers["features"] = _fetch_feature_info
+    payloads = {}
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = {
+            name: pool.submit(fetcher, api_url)
+            for name, fetcher in fetchers.items()
+        }
+        for name, future in futures.items():
+            try:
+                payloads[name] = future.result()
+            except Exception as e:
+                logger.error(f"Error prefetching {name}: {str(e)}")
+                payloads[name] = None
+    return payloads
 
 def display_header():
     """Display the application header"""
     st.markdown('<div class="main-header">💊 Pharmaceutical ML Application</div>', unsafe_allow_html=True)
     st.markdown("---")
 
+@st.fragment(run_every=30)
 def display_api_status():
-    """Display API connection status in sidebar"""
-    st.sidebar.markdown("### 🔗 System Status")
-    
-    api_healthy, health_data = check_api_status()
-    
-    if api_healthy and health_data:
-        st.sidebar.success("✅ API Connected")
-        
+    """Display API connection status in sidebar.
+
+    Runs as a fragment on a 30s cadence, so the status refreshes without
+    re-running the whole page; the connection flag lands in session state
+    for the rest of the script. Fragments cannot call st.sidebar.*
+    directly, so main() invokes this inside a `with st.sidebar:` block.
+    """
+    st.markdown("### 🔗 System Status")
+
+    api_url = get_api_url()
+    health_data = _fetch_health(api_url)
+    api_connected = health_data is not None
+
+    # The main body only needs a full rerun when connectivity actually
+    # flips; steady-state refreshes stay inside this fragment
+    previous = st.session_state.get("api_connected")
+    st.session_state["api_connected"] = api_connected
+    if previous is not None and previous != api_connected:
+        st.rerun()
+
+    # Age of the cached status, driven by the actual probe time rather
+    # than the rerun cadence
+    last_probe = _last_health_probe.get(api_url)
+    age = f"{int(time.time() - last_probe)}s ago" if last_probe else "N/A"
+
+    if health_data:
+        st.success("✅ API Connected")
+
         # Display detailed status
-        with st.sidebar.expander("📊 Detailed Status"):
+        with st.expander("📊 Detailed Status"):
             st.write(f"**API Status:** {health_data.get('status', 'unknown').title()}")
             st.write(f"**Model Loaded:** {'✅' if health_data.get('model_loaded') else '❌'}")
             st.write(f"**Database:** {'✅' if health_data.get('cosmos_db_status') else '❌'}")
             st.write(f"**Version:** {health_data.get('version', 'N/A')}")
-            st.write(f"**Last Check:** {health_data.get('timestamp', 'N/A')}")
-        
-        return True
+            st.write(f"**Last Check:** {age}")
+
     else:
-        st.sidebar.error("❌ API Disconnected")
-        st.sidebar.warning(f"Cannot connect to API at: {get_api_url()}")
-        return False
+        st.error("❌ API Disconnected")
+        st.warning(f"Cannot connect to API at: {get_api_url()}")
+        st.caption(f"Last check: {age}")
 
+    if st.button("🔄 Refresh now", key="health_refresh"):
+        # Only this fragment reruns; the rest of the page is untouched
+        _fetch_sidebar.clear()
+        _fetch_health.clear()
+        st.rerun(scope="fragment")
+
+@st.fragment
 def display_model_info():
-    """Display model information in sidebar"""
-    api_url = get_api_url()
-    
+    """Display model information in sidebar (called within st.sidebar)"""
+    st.markdown("### 🤖 Model Information")
+    # The fetch only happens once the toggle is on, so a collapsed
+    # section costs no HTTP round-trip
+    if not st.toggle("📋 Model Details", key="show_model_info"):
+        return
     try:
-        response = requests.get(f"{api_url}/model/info", timeout=5)
-        if response.status_code == 200:
-            model_info = response.json()
-            
-            st.sidebar.markdown("### 🤖 Model Information")
-            with st.sidebar.expander("📋 Model Details"):
-                st.write(f"**Type:** {model_info.get('model_type', 'N/A')}")
-                st.write(f"**Version:** {model_info.get('model_version', 'N/A')}")
-                st.write(f"**Features:** {model_info.get('feature_count', 0)}")
-                st.write(f"**Trained:** {'✅' if model_info.get('is_trained') else '❌'}")
-                
-                # Training metrics if available
-                training_metrics = model_info.get('training_metrics', {})
-                if training_metrics:
-                    st.write("**Performance:**")
-                    if 'test_accuracy' in training_metrics:
-                        st.write(f"• Accuracy: {training_metrics['test_accuracy']:.3f}")
-                    if 'test_auc' in training_metrics:
-                        st.write(f"• AUC: {training_metrics['test_auc']:.3f}")
-                    
+        model_info = _fetch_model_info(get_api_url())
+        if model_info is not None:
+            # One Markdown table = one delta message instead of one
+            # websocket frame per st.write
+            lines = [
+                "| Field | Value |",
+                "|---|---|",
+                f"| Type | {model_info.get('model_type', 'N/A')} |",
+                f"| Version | {model_info.get('model_version', 'N/A')} |",
+                f"| Features | {model_info.get('feature_count', 0)} |",
+                f"| Trained | {'✅' if model_info.get('is_trained') else '❌'} |"
+            ]
+
+            # Training metrics if available
+            training_metrics = model_info.get('training_metrics', {})
+            if 'test_accuracy' in training_metrics:
+                lines.append(f"| Accuracy | {training_metrics['test_accuracy']:.3f} |")
+            if 'test_auc' in training_metrics:
+                lines.append(f"| AUC | {training_metrics['test_auc']:.3f} |")
+
+            st.markdown("\n".join(lines))
+
     except Exception as e:
         logger.error(f"Error fetching model info: {str(e)}")
 
+@st.fragment
 def display_feature_info():
-    """Display feature information in sidebar"""
-    api_url = get_api_url()
-    
+    """Display feature information in sidebar (called within st.sidebar)"""
+    st.markdown("### 📊 Feature Information")
+    # The fetch only happens once the toggle is on, so a collapsed
+    # section costs no HTTP round-trip
+    if not st.toggle("🔍 Feature Descriptions", key="show_feature_info"):
+        return
     try:
-        response = requests.get(f"{api_url}/model/features", timeout=5)
-        if response.status_code == 200:
-            feature_info = response.json()
-            
-            st.sidebar.markdown("### 📊 Feature Information")
-            with st.sidebar.expander("🔍 Feature Descriptions"):
-                feature_descriptions = feature_info.get('feature_descriptions', {})
-                for feature, description in feature_descriptions.items():
-                    st.write(f"**{feature.replace('_', ' ').title()}:** {description}")
-                    
+        feature_rows = _fetch_feature_info(get_api_url())
+        if feature_rows is not None:
+            st.markdown("\n\n".join(
+                f"**{label}:** {description}"
+                for label, description in feature_rows
+            ))
+
     except Exception as e:
         logger.error(f"Error fetching feature info: {str(e)}")
 
 def main():
     """Main application function"""
+    # Resolve the API URL once; everything below shares this value
+    api_url = get_api_url()
+
     # Display header
     display_header()
     
     # Sidebar navigation
     st.sidebar.markdown("### 🧭 Navigation")
     
+    # Persist the selected page in the URL so bookmarks and reloads land
+    # directly on the right page (and only import its components)
+    pages = ["🔬 Prediction", "📊 Metrics Dashboard"]
+    default = st.query_params.get("page", pages[0])
     page = st.sidebar.selectbox(
         "Choose a page:",
-        ["🔬 Prediction", "📊 Metrics Dashboard"],
-        index=0
+        pages,
+        index=pages.index(default) if default in pages else 0
     )
+    st.query_params["page"] = page
     
-    # API URL configuration (for development)
+    # API URL configuration (for development); a form batches the typing
+    # so the app only reruns on Apply instead of on every keystroke
     if st.sidebar.checkbox("⚙️ Advanced Settings", value=False):
-        current_api_url = get_api_url()
-        new_api_url = st.sidebar.text_input("API URL", value=current_api_url)
-        if new_api_url != current_api_url:
-            os.environ['API_URL'] = new_api_url
-            st.sidebar.success("API URL updated! Please refresh the page.")
+        with st.sidebar.form("api_url_form"):
+            new_api_url = st.text_input("API URL", value=api_url)
+            if st.form_submit_button("Apply"):
+                os.environ['API_URL'] = new_api_url
+                st.session_state["api_url"] = new_api_url
+                # Cached payloads are keyed on the old URL; drop them
+                st.cache_data.clear()
+                st.rerun()
     
     st.sidebar.markdown("---")
 
-    # Check API status and display in sidebar
-    api_connected = display_api_status()
-    
-    if api_connected:
-        display_model_info()
-        display_feature_info()
+    # Warm the fetch caches concurrently, then render the sidebar
+    # fragments; each reads its payload from the cache instantly. The
+    # fragments run inside this container block because calling
+    # st.sidebar.* from within a fragment raises in Streamlit
+    _prefetch_sidebar(api_url)
+    with st.sidebar:
+        display_api_status()
+        api_connected = st.session_state.get("api_connected", False)
+
+        if api_connected:
+            display_model_info()
+            display_feature_info()
 
     # Main content area
     if not api_connected:
@@ -208,25 +414,25 @@ def main():
         ```bash
         uvicorn app.main:app --host 0.0.0.0 --port 8000
         ```
-        """.format(get_api_url()))
-        
-        # Still show navigation for demo purposes
-        if st.button("🔄 Retry Connection"):
-            st.rerun()
-    
-    # Route to selected page
-    api_url = get_api_url()
-    
+        """.format(api_url))
+
+        # Retries happen via the sidebar's Refresh-now button, which
+        # reruns only the health fragment instead of the whole script
+
+    # Route to selected page; components import lazily so a cold start
+    # only pays for the page actually being rendered
     if page == "🔬 Prediction":
         if api_connected:
-            prediction_form = PredictionForm(api_url=api_url)
+            from components.prediction_form import get_prediction_form
+            prediction_form = get_prediction_form(api_url)
             prediction_form.render()
         else:
             st.info("Prediction functionality requires API connection.")
-            
+
     elif page == "📊 Metrics Dashboard":
         if api_connected:
-            metrics_dashboard = MetricsDashboard(api_url=api_url)
+            from components.metrics_dashboard import get_metrics_dashboard
+            metrics_dashboard = get_metrics_dashboard(api_url)
             metrics_dashboard.render()
         else:
             st.info("Metrics dashboard requires API connection.")